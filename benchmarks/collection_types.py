@@ -0,0 +1,68 @@
+"""
+Benchmark converting dictionaries to collections, comparing the JSON round
+trip with cached record types for configuration and request sized data.
+
+Usage: python benchmarks/collection_types.py [output.json]
+"""
+import sys
+from common import timed, report
+
+# Engine configuration sections
+CONFIG = {
+    'engine': {
+        'host': '127.0.0.1', 'port': '10550', 'proto': 'http', 'debug': False, 'log': '/var/log/lense/engine.log',
+        'log_level': 'INFO', 'secret': 'secret', 'manifest_cache': '/var/cache/lense/manifests', 'manifest_codegen': True,
+        'manifest_trace': False, 'manifest_trace_buffer': 100, 'batch_max': 1000, 'user_cache_ttl': 0
+    },
+    'db': {'host': 'localhost', 'port': '3306', 'user': 'lense', 'password': 'secret', 'name': 'lense', 'encryption': False},
+    'ldap': {'enable': False, 'host': 'localhost', 'port': '389', 'bind_dn': '', 'bind_pw': '', 'base_dn': '', 'filter': {'user': 'uid', 'group': 'cn'}},
+    'email': {'smtp_host': 'localhost', 'smtp_port': '25', 'smtp_user': '', 'smtp_pass': '', 'smtp_from': 'lense@localhost'},
+    'socket': {'enable': True, 'host': '127.0.0.1', 'port': '10551', 'bind_ip': '0.0.0.0'},
+    'portal': {'host': '127.0.0.1', 'port': '80', 'proto': 'http'}
+}
+
+def query(count):
+    """
+    Generate request query variables.
+    """
+    return dict([('k{0}'.format(i), 'value-{0}'.format(i)) for i in xrange(count)])
+
+def main(output=None):
+    from lense.common import collection
+    from lense.common.collection import Collection
+
+    # Count record types created by each method
+    created = [0]
+    namedtuple = collection.namedtuple
+    def counted(*args, **kwargs):
+        created[0] += 1
+        return namedtuple(*args, **kwargs)
+    collection.namedtuple = counted
+
+    # Data: (name, dictionary)
+    data = [
+        ('config', CONFIG),
+        ('query_5', query(5)),
+        ('query_50', query(50)),
+        ('post_nested', {'hosts': [dict(query(5), name='host{0}'.format(i)) for i in xrange(20)], 'job': 'provision'})
+    ]
+
+    results = []
+    for name, value in data:
+        result = {'data': name}
+        for mode, cached in [('json', False), ('cached', True)]:
+            Collection(value, cached=cached).get()
+
+            # Record types created per conversion after the first
+            created[0] = 0
+            Collection(value, cached=cached).get()
+            result['{0}_types'.format(mode)] = created[0]
+
+            # Time per conversion
+            result['{0}_us'.format(mode)] = round(timed(lambda: Collection(value, cached=cached).get(), number=500), 1)
+        results.append(result)
+    collection.namedtuple = namedtuple
+    report('collection_types', results, output)
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
@@ -0,0 +1,315 @@
+"""
+Shared helpers for the Lense benchmark scripts.
+"""
+import sys
+import json
+import logging
+import __builtin__
+from uuid import uuid4
+from timeit import default_timer
+from os.path import dirname, abspath, join
+
+# Run against the source tree
+ROOT = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, join(ROOT, 'usr/lib/python2.7/dist-packages'))
+
+class Namespace(object):
+    """
+    Simple attribute container.
+    """
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+def timed(method, number=1000, repeat=3):
+    """
+    Run a method repeatedly and return the best average time per call in microseconds.
+
+    :param method: The method to time
+    :type  method: callable
+    :param number: Calls per timing run
+    :type  number: int
+    :param repeat: Number of timing runs
+    :type  repeat: int
+    :rtype: float
+    """
+    best = None
+    for r in xrange(repeat):
+        start = default_timer()
+        for n in xrange(number):
+            method()
+        elapsed = (default_timer() - start) / number
+        best = elapsed if (best is None or elapsed < best) else best
+    return best * 1000000
+
+def commons(cls=Namespace, **kwargs):
+    """
+    Register a minimal commons object for benchmarking modules that do not
+    need a database or project configuration.
+
+    :param cls: The commons class, i.e. a Namespace with request context attributes
+    :type  cls: type
+    """
+    from lense.common.base import LenseBase
+    from lense.common.context import LenseContext
+    from lense.common.manifest.resolver import ManifestResolver
+
+    # Commons attributes
+    attrs = {
+        'LOG': logging.getLogger('lense.benchmark'),
+        'CONF': Namespace(engine=Namespace(debug=False, manifest_codegen=False)),
+        'CONTEXT': LenseContext(),
+        'bootstrap': False,
+        'uuid4': lambda: str(uuid4()),
+        'ensure': lambda result, **kw: LenseBase.ensure.__func__(__builtin__.LENSE, result, **kw)
+    }
+    attrs.update(kwargs)
+
+    # Register in the global namespace, discarding paths bound to the previous commons
+    __builtin__.LENSE = cls(**attrs)
+    ManifestResolver.rebind()
+    return __builtin__.LENSE
+
+def django_setup(lense=False):
+    """
+    Configure Django with an in-memory SQLite database.
+
+    :param lense: Install the Lense object applications and create their tables
+    :type  lense: bool
+    """
+    import django
+    from django.conf import settings
+    from lense import get_applications
+
+    if not settings.configured:
+        apps  = ['django.contrib.contenttypes', 'django.contrib.auth', 'django.contrib.sessions']
+        attrs = {} if not lense else {
+            'AUTH_USER_MODEL': 'user.APIUser',
+            'API_TOKEN_LIFE': 1,
+            'USE_TZ': True
+        }
+        settings.configure(
+            DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+            INSTALLED_APPS=apps if not lense else get_applications(apps),
+            SECRET_KEY='benchmark',
+            **attrs
+        )
+    django.setup()
+
+    # Create the Lense object tables
+    if lense:
+        from django.core.management import call_command
+        call_command('migrate', verbosity=0, interactive=False)
+
+def context_commons(**kwargs):
+    """
+    Register a commons object with a thread local request context, as set up
+    for a project by LenseCommon.
+    """
+    from lense.common.http import LenseHTTP
+    from lense.common.manifest import LenseManifest
+    from lense.common.request import LenseRequestObject
+    from lense.common.context import LenseContext, context_attribute
+
+    class ContextCommons(Namespace):
+        """
+        Commons object with per-request attributes in a thread local context.
+        """
+        REQUEST  = context_attribute('REQUEST')
+        MANIFEST = context_attribute('MANIFEST')
+        AUTH     = context_attribute('AUTH')
+        SOCKET   = context_attribute('SOCKET')
+
+    # Request context / common libraries
+    attrs = {
+        'CONTEXT': LenseContext(
+            REQUEST  = LenseRequestObject,
+            MANIFEST = lambda: LenseManifest,
+            AUTH     = None,
+            SOCKET   = None,
+            API_LOG  = None
+        ),
+        'HTTP': LenseHTTP
+    }
+    attrs.update(kwargs)
+    return commons(ContextCommons, **attrs)
+
+def engine_commons(**kwargs):
+    """
+    Register a request context commons object with the Lense object managers
+    and permissions, for running handler manifests against the database.
+    """
+    from lense.common import LenseSetup
+    from lense.common.vars import USERS
+    from lense.common.api import LenseAPIConstructor
+    from lense.common.objects import LenseAPIObjects
+    from lense.common.permissions import LensePermissions
+
+    attrs = {
+        'SETUP': LenseSetup,
+        'API': LenseAPIConstructor,
+        'PERMISSIONS': LensePermissions,
+        'USERS': USERS,
+        'PROJECT': Namespace(name='ENGINE')
+    }
+    attrs.update(kwargs)
+    LENSE = context_commons(**attrs)
+
+    # Object managers import their models, construct once the commons exist
+    LENSE.OBJECTS = LenseAPIObjects()
+    return LENSE
+
+def fixtures(users=10):
+    """
+    Create the administrator and a number of regular users with group
+    memberships, API keys, API tokens and permissions.
+
+    :param users: The number of regular users to create
+    :type  users: int
+    """
+    from lense.common.vars import GROUPS, USERS
+    from datetime import timedelta
+    from django.utils import timezone
+    from lense.common.objects.user.models import APIUser, APIUserKeys, APIUserTokens
+    from lense.common.objects.group.models import APIGroups, APIGroupMembers
+    from lense.common.objects.permissions.models import Permissions
+
+    # Groups
+    groups = {}
+    for group in [GROUPS.ADMIN, GROUPS.USER]:
+        groups[group.UUID] = APIGroups.objects.create(uuid=group.UUID, name=group.NAME, desc=group.NAME, protected=True)
+
+    # Users / memberships / keys / permissions
+    accounts = [(USERS.ADMIN.UUID, USERS.ADMIN.NAME, GROUPS.ADMIN.UUID)]
+    accounts.extend([(str(uuid4()), 'user{0}'.format(i), GROUPS.USER.UUID) for i in xrange(users)])
+    for uuid, name, group in accounts:
+        user = APIUser.objects.create(uuid=uuid, username=name, email='{0}@localhost'.format(name))
+        APIGroupMembers.objects.create(uuid=str(uuid4()), group=groups[group], member=user)
+        APIUserKeys.objects.create(uuid=str(uuid4()), user=user, key=uuid4().hex)
+        APIUserTokens.objects.create(uuid=str(uuid4()), user=user, token=uuid4().hex, expires=timezone.now() + timedelta(days=1))
+        Permissions.objects.create(object_uuid=uuid, owner=uuid, group=group, user_read=True, group_read=True)
+
+def handler(name, path, method='GET'):
+    """
+    Create a handler record for a bootstrap handler manifest, owned by the
+    administrator.
+
+    :param   name: The manifest name, i.e. User_Get
+    :type    name: str
+    :param   path: The handler path
+    :type    path: str
+    :param method: The handler method
+    :type  method: str
+    :rtype: str
+    """
+    from lense.common.vars import GROUPS, USERS
+    from lense.common.objects.handler.models import Handlers, HandlerManifests
+    from lense.common.objects.permissions.models import Permissions
+
+    uuid = str(uuid4())
+    record = Handlers.objects.create(uuid=uuid, name=name, path=path, desc=name, method=method, protected=True, enabled=True)
+    HandlerManifests.objects.create(handler=record, json=manifest(name))
+    Permissions.objects.create(object_uuid=uuid, owner=USERS.ADMIN.UUID, group=GROUPS.ADMIN.UUID, user_exec=True, group_exec=True)
+    return uuid
+
+def request(path, data=None, method='GET', user=None, token=None):
+    """
+    Set up a new request for the current thread.
+
+    :param   path: The request path
+    :type    path: str
+    :param   data: The request data
+    :type    data: dict
+    :param method: The request method
+    :type  method: str
+    :param   user: The API user making the request
+    :type    user: str
+    :param  token: The API token of the user
+    :type   token: str
+    """
+    LENSE.REQUEST.set(wsgi_request(path, data, method, user, token))
+    return LENSE.REQUEST
+
+def wsgi_request(path, data=None, method='GET', user=None, token=None):
+    """
+    Build a Django request through LenseWSGIRequest with API headers.
+
+    :param   path: The request path
+    :type    path: str
+    :param   data: The request data
+    :type    data: dict
+    :param method: The request method
+    :type  method: str
+    :param   user: The API user making the request
+    :type    user: str
+    :param  token: The API token of the user
+    :type   token: str
+    """
+    from lense.common.http import HEADER, HEADER_FORMAT
+    from lense.common.request import LenseWSGIRequest
+
+    django_request = LenseWSGIRequest.get(path=path, data=data, method=method)
+    for header, value in [(HEADER.API_USER, user), (HEADER.API_TOKEN, token)]:
+        if value:
+            django_request.META[HEADER_FORMAT(header)] = value
+    return django_request
+
+def manifest(name):
+    """
+    Load a bootstrap handler manifest.
+
+    :param name: The manifest name, i.e. User_Get
+    :type  name: str
+    :rtype: list
+    """
+    with open(join(ROOT, 'usr/share/lense/bootstrap/manifests/{0}.json'.format(name)), 'r') as f:
+        return json.loads(f.read())
+
+def environment():
+    """
+    Describe the benchmark environment, so results can be compared between
+    releases.
+
+    :rtype: dict
+    """
+    import platform
+    from subprocess import Popen, PIPE
+
+    # Source revision, if running from a git checkout
+    try:
+        revision = Popen(['git', 'rev-parse', 'HEAD'], cwd=ROOT, stdout=PIPE, stderr=PIPE).communicate()[0].strip() or None
+    except OSError:
+        revision = None
+
+    try:
+        import django
+        django_version = django.get_version()
+    except ImportError:
+        django_version = None
+    return {
+        'python': platform.python_version(),
+        'django': django_version,
+        'platform': platform.platform(),
+        'revision': revision
+    }
+
+def report(name, results, output=None, **meta):
+    """
+    Print benchmark results and optionally write them to a JSON file.
+
+    :param    name: The benchmark name
+    :type     name: str
+    :param results: A list of result dictionaries
+    :type  results: list
+    :param  output: An optional JSON output file
+    :type   output: str
+    :param    meta: Additional benchmark parameters to include in the output file
+    :type     meta: dict
+    """
+    print('# {0}'.format(name))
+    for result in results:
+        print('  '.join(['{0}={1}'.format(k, result[k]) for k in sorted(result.keys())]))
+
+    # Write machine readable results
+    if output:
+        with open(output, 'w') as f:
+            f.write(json.dumps({'benchmark': name, 'environment': environment(), 'parameters': meta, 'results': results}, indent=2))
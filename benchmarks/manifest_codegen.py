@@ -0,0 +1,49 @@
+"""
+Benchmark interpreted versus generated manifest execution.
+
+Usage: python benchmarks/manifest_codegen.py [output.json]
+"""
+import sys
+from shutil import rmtree
+from tempfile import mkdtemp
+from common import Namespace, django_setup, commons, timed, report
+from manifest_index import generate
+
+def main(output=None):
+    django_setup()
+    from lense.common.manifest import LenseManifest
+    from lense.common.manifest.cache import ManifestCache
+
+    # Commons required by the manifest engine
+    cache = mkdtemp()
+    LENSE = commons(
+        CONF=Namespace(engine=Namespace(debug=False, manifest_codegen=False, manifest_cache=cache)),
+        REQUEST=Namespace(data={}, path='benchmark', method='GET', uuid='benchmark'),
+        OBJECTS=Namespace(noop=lambda *args: None, dump=lambda obj: obj, walkattr=lambda obj, keys: obj),
+        MANIFEST=LenseManifest
+    )
+    LENSE.REQUEST.ensure = LENSE.ensure
+
+    # Execute each manifest size
+    results = []
+    try:
+        for size in [50, 100, 250, 500]:
+            manifest = generate(size)
+
+            def execute():
+                LENSE.MANIFEST.setup(manifest, 'benchmark-{0}'.format(size))
+                LENSE.MANIFEST.MANAGER.execute()
+
+            # Interpreted / generated execution
+            result = {'objects': size}
+            for mode in [False, True]:
+                LENSE.CONF.engine.manifest_codegen = mode
+                ManifestCache.invalidate()
+                result['generated_us' if mode else 'interpreted_us'] = round(timed(execute, number=50), 1)
+            results.append(result)
+    finally:
+        rmtree(cache)
+    report('manifest_codegen', results, output)
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
@@ -0,0 +1,53 @@
+"""
+Benchmark compiled manifest execution for manifests with 50 to 500 objects.
+
+Usage: python benchmarks/manifest_index.py [output.json]
+"""
+import sys
+from common import Namespace, commons, timed, report
+
+def generate(size):
+    """
+    Generate a manifest alternating variables that reference the previous
+    variable and actions that reference the data block and previous variable.
+    """
+    manifest = [{'var#v0': {'value': 0}}]
+    last     = 'v0'
+    for i in xrange(1, size):
+        if i % 2:
+            manifest.append({'var#v{0}'.format(i): '#{0}'.format(last)})
+            last = 'v{0}'.format(i)
+        else:
+            manifest.append({'do#a{0}'.format(i): {'call': 'LENSE.OBJECTS.noop', 'args': ['#__DATA__', '#{0}'.format(last)]}})
+    manifest.append({'response': {'data': '#{0}'.format(last)}})
+    return manifest
+
+def main(output=None):
+    from lense.common.manifest import LenseManifest
+
+    # Commons required by the manifest engine
+    LENSE = commons(
+        REQUEST=Namespace(data={}, path='benchmark', method='GET', uuid='benchmark'),
+        OBJECTS=Namespace(noop=lambda *args: None, dump=lambda obj: obj),
+        MANIFEST=LenseManifest
+    )
+    LENSE.REQUEST.ensure = LENSE.ensure
+
+    # Execute each manifest size
+    results = []
+    for size in [50, 100, 250, 500]:
+        manifest = generate(size)
+
+        def execute():
+            LENSE.MANIFEST.setup(manifest, 'benchmark-{0}'.format(size))
+            LENSE.MANIFEST.MANAGER.execute()
+
+        # Time cached execution
+        results.append({
+            'objects': size,
+            'execute_us': round(timed(execute, number=50), 1)
+        })
+    report('manifest_index', results, output)
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
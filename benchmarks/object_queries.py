@@ -0,0 +1,69 @@
+"""
+Query count regression check for the object interfaces. Runs object lookups
+against an in-memory SQLite database and fails if any lookup runs more
+database queries than its budget. Budgets are for the administrator and ten
+regular users created by the fixtures.
+
+Usage: python benchmarks/object_queries.py [output.json]
+"""
+import sys
+from common import django_setup, engine_commons, fixtures, handler, request, report
+
+# Lookups: (name, object interface path, method, filter, expected result, query budget)
+LOOKUPS = [
+    ('user_none', 'USER', 'get_internal', {'username': 'nobody'}, None, 1),
+    ('user_exists', 'USER', 'exists', {'username': 'user0'}, True, 1),
+    ('user_exists_none', 'USER', 'exists', {'username': 'nobody'}, False, 1),
+    ('key_single', 'USER.KEY', 'get_internal', {'user': 'admin'}, 'object', 1),
+    ('key_all', 'USER.KEY', 'get_internal', {}, 'list', 1),
+    ('member_multiple', 'GROUP.MEMBERS', 'get_internal', {'group': 'users'}, 'list', 1),
+    ('group_single', 'GROUP', 'get_internal', {'uuid': 'users'}, 'object', 1),
+    ('handler_single', 'HANDLER', 'get_internal', {'name': 'User_Get'}, 'object', 1),
+    ('user_single', 'USER', 'get_internal', {'username': 'user0'}, 'object', 4),
+    ('user_all', 'USER', 'get_internal', {}, 'list', 4),
+    ('user_read', 'USER', 'get', {'username': 'user0'}, 'object', 4),
+    ('user_read_all', 'USER', 'get', {}, 'list', 4)
+]
+
+def main(output=None):
+    django_setup(lense=True)
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from lense.common.vars import GROUPS, USERS
+
+    # Engine commons / database records
+    LENSE = engine_commons()
+    fixtures(10)
+    handler('User_Get', 'user')
+    request('user', user=USERS.ADMIN.NAME)
+    LENSE.REQUEST.USER
+
+    # Filter values for fixture records
+    values = {'admin': USERS.ADMIN.UUID, 'users': GROUPS.USER.UUID}
+
+    results, failed = [], []
+    for name, path, method, kwargs, expected, budget in LOOKUPS:
+        interface = LENSE.OBJECTS
+        for attr in path.split('.'):
+            interface = getattr(interface, attr)
+        kwargs = dict([(k, values.get(v, v)) for k,v in kwargs.iteritems()])
+
+        # Run the lookup
+        with CaptureQueriesContext(connection) as queries:
+            result = getattr(interface, method)(**kwargs)
+
+        # Result shape
+        shape = 'list' if isinstance(result, list) else ('object' if hasattr(result, '_meta') else result)
+        passed = (shape == expected) and len(queries) <= budget
+        results.append({'lookup': name, 'queries': len(queries), 'budget': budget, 'result': str(shape), 'passed': passed})
+        if not passed:
+            failed.append(name)
+
+    # Report any failed lookups
+    for name in failed:
+        print('failed: {0}'.format(name))
+    report('object_queries', results, output, users=10)
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main(*sys.argv[1:2]))
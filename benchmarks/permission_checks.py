@@ -0,0 +1,65 @@
+"""
+Benchmark LensePermissions.can_read with the requesting principal resolved
+through an extended user lookup on every check (the previous behaviour),
+resolved once per request, and with permission rows served from the ACL index.
+
+Usage: python benchmarks/permission_checks.py [calls] [output.json]
+"""
+import sys
+from common import django_setup, engine_commons, fixtures, request, timed, report
+
+def main(calls=10000, output=None):
+    django_setup(lense=True)
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from lense.common.vars import GROUPS
+    from lense.common.permissions import LensePermissions, LensePrincipal
+    from lense.common.objects.permissions.cache import PermissionsCache
+
+    # Engine commons / database records
+    LENSE = engine_commons(PERMISSIONS=LensePermissions)
+    fixtures(10)
+    calls = int(calls)
+
+    def per_call(cls):
+        """
+        Resolve the principal from the extended user object for each check.
+        """
+        user   = LENSE.OBJECTS.USER.get_internal(uuid=LENSE.REQUEST.USER.uuid)
+        groups = frozenset([x['uuid'] for x in user.groups])
+        return LensePrincipal(user.uuid, LENSE.REQUEST.USER.group, groups, GROUPS.ADMIN.UUID in groups)
+
+    # Principal resolution: per check / per request / per request with the ACL index
+    request_principal = LensePermissions.__dict__['_principal']
+    modes = [
+        ('per_call', classmethod(per_call), 0),
+        ('request', request_principal, 0),
+        ('indexed', request_principal, 300)
+    ]
+
+    results = []
+    for user, target in [('admin', 'user0'), ('user0', 'user0'), ('user0', 'user1')]:
+        request('user', user=user).USER
+        obj = LENSE.OBJECTS.USER.get_internal(username=target)
+        for mode, principal, ttl in modes:
+            LensePermissions._principal = principal
+            LENSE.CONF.engine.acl_cache_ttl = ttl
+            PermissionsCache.invalidate()
+            LENSE.PERMISSIONS.can_read(obj)
+
+            # Time the checks / count queries for a single check
+            with CaptureQueriesContext(connection) as queries:
+                allowed = LENSE.PERMISSIONS.can_read(obj)
+            results.append({
+                'user': user,
+                'object': target,
+                'mode': mode,
+                'allowed': allowed,
+                'queries': len(queries),
+                'us_per_call': round(timed(lambda: LENSE.PERMISSIONS.can_read(obj), number=calls, repeat=1), 1)
+            })
+    LensePermissions._principal = request_principal
+    report('permission_checks', results, output, calls=calls)
+
+if __name__ == '__main__':
+    main(*sys.argv[1:3])
@@ -0,0 +1,113 @@
+"""
+Stress test the thread local request context. Concurrent requests are set up
+through LenseWSGIRequest and each thread checks that it only ever sees its own
+request, authentication, logger, manifest and resolved commons paths.
+
+Usage: python benchmarks/request_context.py [threads] [requests] [output.json]
+"""
+import sys
+from time import sleep
+from threading import Thread
+from timeit import default_timer
+from common import django_setup, context_commons, report
+
+# Request manifest, executed concurrently so worker threads share the request
+MANIFEST = [
+    {'options': {'execute': 'concurrent', 'workers': 2}},
+    {'var#path': 'LENSE.REQUEST.path'},
+    {'var#uuid': 'LENSE.REQUEST.uuid'},
+    {'response': {'data': {'path': '#path', 'uuid': '#uuid', 'data': '#__DATA__'}}}
+]
+
+def worker(index, requests, errors, completed):
+    """
+    Run requests for a single thread and record any request attributes that do
+    not belong to the thread.
+
+    :param     index: The thread index
+    :type      index: int
+    :param  requests: The number of requests to run
+    :type   requests: int
+    :param    errors: Shared list of cross-talk errors
+    :type     errors: list
+    :param completed: Shared list of completed requests per thread
+    :type  completed: list
+    """
+    from lense.common.http import HTTP_GET, HTTP_POST
+    from lense.common.request import LenseWSGIRequest
+    from lense.common.manifest.resolver import ManifestResolver
+
+    for n in xrange(requests):
+        path = 'context/{0}/{1}'.format(index, n)
+        data = {'thread': 't{0}'.format(index), 'request': 'r{0}'.format(n)}
+
+        # Failed requests are recorded, including exit() calls from import_class
+        try:
+
+            # Set up the request
+            LENSE.REQUEST.set(LenseWSGIRequest.get(path=path, data=data, method=HTTP_POST if n % 2 else HTTP_GET))
+            LENSE.API.create_logger()
+            request, auth, logger, uuid = LENSE.REQUEST, LENSE.AUTH, LENSE.API.LOG, LENSE.REQUEST.uuid
+
+            # Let other threads replace their requests
+            sleep(0)
+
+            # Execute the manifest
+            LENSE.MANIFEST.setup(MANIFEST, 'context')
+            response = LENSE.MANIFEST.MANAGER.execute()
+
+            # Everything must still belong to this thread's request
+            checks = {
+                'request': LENSE.REQUEST is request,
+                'auth': LENSE.AUTH is auth,
+                'logger': LENSE.API.LOG is logger,
+                'path': LENSE.REQUEST.path == path,
+                'uuid': LENSE.REQUEST.uuid == uuid,
+                'data': LENSE.REQUEST.data == data,
+                'resolver': ManifestResolver.resolve('LENSE.REQUEST.path') == path,
+                'manifest': isinstance(response, dict) and response.get('data') == {'path': path, 'uuid': uuid, 'data': data}
+            }
+
+        # Request failed or request state replaced by another thread
+        except (Exception, SystemExit) as e:
+            errors.append({'thread': index, 'request': n, 'check': 'exception', 'error': repr(e)})
+            continue
+
+        for check, passed in checks.iteritems():
+            if not passed:
+                errors.append({'thread': index, 'request': n, 'check': check})
+        completed[index] += 1
+
+def main(threads=8, requests=250, output=None):
+    django_setup()
+    from lense.common import LenseSetup
+    from lense.common.api import LenseAPIConstructor
+
+    # Commons required by the request, manifest and API objects
+    LENSE = context_commons(SETUP=LenseSetup, API=LenseAPIConstructor)
+
+    # Run the request threads
+    threads, requests, errors = int(threads), int(requests), []
+    completed = [0] * threads
+    workers   = [Thread(target=worker, args=(i, requests, errors, completed)) for i in xrange(threads)]
+    start = default_timer()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = default_timer() - start
+
+    # Report any cross-talk, every request must have completed
+    for error in errors[:10]:
+        print('cross-talk: {0}'.format(error))
+    report('request_context', [{
+        'threads': threads,
+        'requests': threads * requests,
+        'completed': sum(completed),
+        'errors': len(errors),
+        'requests_per_sec': round(sum(completed) / elapsed, 1)
+    }], output)
+    return 1 if (errors or not sum(completed) == threads * requests) else 0
+
+if __name__ == '__main__':
+    sys.exit(main(*sys.argv[1:4]))
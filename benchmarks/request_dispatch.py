@@ -0,0 +1,65 @@
+"""
+Benchmark dispatching requests in-process. Compares building a request through
+LenseWSGIRequest (RequestFactory, JSON encoding and parsing) with setting up the
+request directly, for request setup alone and for running the User_Get handler.
+
+Usage: python benchmarks/request_dispatch.py [output.json]
+"""
+import sys
+from common import django_setup, engine_commons, fixtures, handler, request, timed, report
+
+def hosts(count):
+    """
+    Generate provisioning style request data.
+    """
+    return {'job': 'provision', 'hosts': [{'name': 'host{0}'.format(i), 'roles': ['web', 'worker']} for i in xrange(count)]}
+
+def main(output=None):
+    django_setup(lense=True)
+    from lense.common.vars import USERS
+    from lense.common.http import HTTP_GET, HTTP_POST
+    from lense.common.manifest.batch import ManifestBatch
+
+    # Engine commons / database records
+    LENSE = engine_commons()
+    fixtures(5)
+    handler('User_Get', 'user', HTTP_GET)
+
+    def wsgi(path, method, data):
+        request(path, data=data, method=method, user=USERS.ADMIN.NAME)
+        return LENSE.REQUEST.data
+
+    def direct(path, method, data):
+        LENSE.REQUEST.set_direct(path, method, data, user=USERS.ADMIN.NAME)
+        return LENSE.REQUEST.data
+
+    def wsgi_handler():
+        request('user', method=HTTP_GET, user=USERS.ADMIN.NAME)
+        uuid, manifest = ManifestBatch.handler(LENSE.REQUEST.path, LENSE.REQUEST.method)
+        LENSE.MANIFEST.setup(manifest, uuid)
+        return LENSE.MANIFEST.MANAGER.execute()
+
+    def direct_handler():
+        return LENSE.MANIFEST.dispatch('user', HTTP_GET, user=USERS.ADMIN.NAME)
+
+    # Request data
+    small, large = hosts(20), hosts(1200)
+
+    # Operations: (name, WSGI method, direct method, calls per timing run)
+    operations = [
+        ('setup_get', lambda: wsgi('user', HTTP_GET, {'uuid': USERS.ADMIN.UUID}), lambda: direct('user', HTTP_GET, {'uuid': USERS.ADMIN.UUID}), 2000),
+        ('setup_post_1kb', lambda: wsgi('host', HTTP_POST, small), lambda: direct('host', HTTP_POST, small), 2000),
+        ('setup_post_64kb', lambda: wsgi('host', HTTP_POST, large), lambda: direct('host', HTTP_POST, large), 200),
+        ('User_Get', wsgi_handler, direct_handler, 20)
+    ]
+
+    results = []
+    for name, wsgi_method, direct_method, number in operations:
+        result = {'operation': name}
+        for mode, method in [('wsgi', wsgi_method), ('direct', direct_method)]:
+            result['{0}_us'.format(mode)] = round(timed(method, number=number), 1)
+        results.append(result)
+    report('request_dispatch', results, output)
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
@@ -0,0 +1,67 @@
+"""
+Benchmark the cost of debug log messages on the request path. The User_Get
+handler manifest is run against an SQLite database with the logger at INFO,
+first formatting every debug message before the logger discards it (eager),
+then only formatting messages for enabled log levels (lazy).
+
+Usage: python benchmarks/request_logging.py [users] [output.json]
+"""
+import sys
+import logging
+from os import devnull
+from common import django_setup, engine_commons, fixtures, request, manifest, timed, report
+
+class CountingLogger(logging.Logger):
+    """
+    Logger recording the number and size of formatted messages. In eager mode
+    every level reports as enabled, so messages are formatted and then dropped
+    by the logger as before lazy log messages.
+    """
+    eager    = False
+    messages = 0
+    size     = 0
+
+    def isEnabledFor(self, level):
+        return self.eager or logging.Logger.isEnabledFor(self, level)
+
+    def _log(self, level, msg, args, **kwargs):
+        self.messages += 1
+        self.size     += len(msg)
+        if logging.Logger.isEnabledFor(self, level):
+            logging.Logger._log(self, level, msg, args, **kwargs)
+
+def main(users=10, output=None):
+    django_setup(lense=True)
+    from lense.common.vars import USERS
+
+    # Logger at INFO, written to the null device
+    logger = CountingLogger('lense.benchmark')
+    logger.setLevel(logging.INFO)
+    logger.addHandler(logging.StreamHandler(open(devnull, 'w')))
+
+    # Engine commons / database records
+    LENSE = engine_commons(LOG=logger)
+    fixtures(int(users))
+    handler = manifest('User_Get')
+
+    def user_get():
+        request('user', user=USERS.ADMIN.NAME)
+        LENSE.MANIFEST.setup(handler, 'User_Get')
+        LENSE.MANIFEST.MANAGER.execute()
+
+    results = []
+    for mode in ['eager', 'lazy']:
+        logger.eager = mode == 'eager'
+
+        # Formatted messages for a single request
+        logger.messages, logger.size = 0, 0
+        user_get()
+        result = {'mode': mode, 'messages': logger.messages, 'message_bytes': logger.size}
+
+        # Time per request
+        result['request_us'] = round(timed(user_get, number=20), 1)
+        results.append(result)
+    report('request_logging', results, output)
+
+if __name__ == '__main__':
+    main(*sys.argv[1:3])
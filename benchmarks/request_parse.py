@@ -0,0 +1,73 @@
+"""
+Benchmark request body and query string parsing for realistic payload sizes.
+
+Usage: python benchmarks/request_parse.py [output.json]
+"""
+import sys
+import json
+from common import Namespace, commons, timed, report
+
+def hosts(count):
+    """
+    Generate a provisioning style JSON payload with a list of host records.
+    """
+    return json.dumps({
+        'job': 'provision',
+        'dry_run': 'False',
+        'hosts': [{
+            'name': 'host-{0}.example.com'.format(i),
+            'ip': '10.0.{0}.{1}'.format(i // 256, i % 256),
+            'roles': ['web', 'worker'],
+            'memory': 4096,
+            'tags': {'rack': 'r{0}'.format(i % 40), 'zone': 'us-east-{0}'.format(i % 3)}
+        } for i in xrange(count)]
+    })
+
+def query(count):
+    """
+    Generate a query string with mixed value types.
+    """
+    values = ['{0}', 'name%20{0}', 'True', '[{0},{0}]', 'value-{0}']
+    return '&'.join(['k{0}={1}'.format(i, values[i % len(values)].format(i)) for i in xrange(count)])
+
+def main(output=None):
+    from lense.common import request, http
+    from lense.common.http import LenseHTTP, MIME_TYPE
+    from lense.common.request import LenseRequestObject
+
+    # Commons required by the request object
+    LENSE = commons(HTTP=LenseHTTP)
+
+    # Payloads: (name, body, query string, content type)
+    payloads = [
+        ('query_10', '', query(10), ''),
+        ('query_100', '', query(100), ''),
+        ('form_100', query(100), '', MIME_TYPE.APPLICATION.FORM),
+        ('json_1kb', hosts(5), '', MIME_TYPE.APPLICATION.JSON),
+        ('json_64kb', hosts(300), '', MIME_TYPE.APPLICATION.JSON),
+        ('json_1mb', hosts(5000), '', MIME_TYPE.APPLICATION.JSON)
+    ]
+
+    # Decoders: standard library / fastest available
+    decoders = [('json', json.loads)]
+    if not http.json_decode is json.loads:
+        decoders.append((http.json_decode.__module__, http.json_decode))
+
+    results = []
+    for name, body, query_str, content_type in payloads:
+        obj = LenseRequestObject()
+        obj.DJANGO = Namespace(body=body, read=lambda *args: body, META={'QUERY_STRING': query_str, 'CONTENT_TYPE': content_type})
+        obj.HEADERS = LenseHTTP.headers(obj.DJANGO.META)
+        number = 5 if len(body) > 100000 else 200
+
+        # Time each decoder
+        result = {'payload': name, 'bytes': len(body) + len(query_str)}
+        for label, decoder in decoders:
+            request.json_decode = http.json_decode = decoder
+            result['{0}_us'.format(label)] = round(timed(obj._load_data, number=number), 1)
+        results.append(result)
+    request.json_decode = http.json_decode = decoders[-1][1]
+    report('request_parse', results, output)
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
@@ -0,0 +1,149 @@
+"""
+Request pipeline benchmark suite. Requests built with LenseWSGIRequest are run
+through each stage of an engine request against an in-memory SQLite database:
+
+    build    - LenseWSGIRequest.get
+    setup    - LenseSetup.engine (LenseRequestObject.set, logger, socket)
+    auth     - API token authentication
+    map      - LenseAPIRequestMapper.run
+    manifest - handler manifest execution
+    response - LenseHTTP.success
+
+Reports the time, database queries and net allocated objects per stage for
+each handler request. Write the results to a JSON file to track regressions
+between releases.
+
+Usage: python benchmarks/request_pipeline.py [requests] [users] [output.json]
+"""
+import gc
+import sys
+import logging
+from os import devnull
+from timeit import default_timer
+from collections import OrderedDict
+from common import Namespace, django_setup, engine_commons, fixtures, handler, wsgi_request, report
+
+# Handler requests: (name, manifest, path, method, data)
+REQUESTS = [
+    ('User_Get', 'User_Get', 'user', 'GET', None),
+    ('User_Get_uuid', 'User_Get', 'user', 'GET', 'admin'),
+    ('Group_Get', 'Group_Get', 'group', 'GET', None),
+    ('Handler_Get', 'Handler_Get', 'handler', 'GET', None)
+]
+
+def pipeline(path, method, data, user, token):
+    """
+    Build the stages for a single request.
+
+    :rtype: OrderedDict
+    """
+    state = {}
+
+    def build():
+        state['request'] = wsgi_request(path, data, method, user, token)
+
+    def setup():
+        LENSE.SETUP.engine(state['request'])
+
+    def auth():
+        LENSE.AUTH.TOKEN(LENSE.REQUEST.USER.name, LENSE.REQUEST.token)
+
+    def map():
+        state['map'] = LENSE.API.map_request()
+
+    def manifest():
+        handler = LENSE.OBJECTS.HANDLER.get(uuid=state['map']['uuid'])
+        LENSE.MANIFEST.setup(handler.manifest, handler.uuid)
+        state['response'] = LENSE.MANIFEST.MANAGER.execute()
+
+    def response():
+        LENSE.HTTP.success(state['response'].get('message'), state['response'].get('data'))
+
+    return OrderedDict([(f.__name__, f) for f in [build, setup, auth, map, manifest, response]])
+
+def measure(stages):
+    """
+    Run a request once, counting database queries and net allocated objects
+    per stage with the garbage collector disabled.
+
+    :rtype: dict
+    """
+    from django.db import connection
+
+    counts = {}
+    connection.force_debug_cursor = True
+    gc.collect()
+    gc.disable()
+    try:
+        for name, stage in stages.iteritems():
+            queries, objects = len(connection.queries_log), len(gc.get_objects())
+            stage()
+            counts[name] = {
+                'queries': len(connection.queries_log) - queries,
+                'objects': len(gc.get_objects()) - objects
+            }
+    finally:
+        gc.enable()
+        connection.force_debug_cursor = False
+    return counts
+
+def main(requests=50, users=10, output=None):
+    django_setup(lense=True)
+    from lense.common.vars import USERS
+    from lense.common.objects.user.models import APIUserTokens
+
+    # Logger at INFO, written to the null device
+    logger = logging.getLogger('lense.benchmark.pipeline')
+    logger.setLevel(logging.INFO)
+    logger.addHandler(logging.StreamHandler(open(devnull, 'w')))
+
+    # Engine commons / database records
+    LENSE = engine_commons(LOG=logger, CONF=Namespace(
+        engine=Namespace(debug=False, manifest_codegen=False),
+        socket=Namespace(enable=False)
+    ))
+    fixtures(int(users))
+    for manifest in set([r[1] for r in REQUESTS]):
+        handler(manifest, [r[2] for r in REQUESTS if r[1] == manifest][0])
+    token = APIUserTokens.objects.get(user=USERS.ADMIN.UUID).token
+
+    results = []
+    for name, manifest, path, method, data in REQUESTS:
+        data   = {'uuid': USERS.ADMIN.UUID} if data == 'admin' else data
+        stages = pipeline(path, method, data, USERS.ADMIN.NAME, token)
+
+        # Warm up, then count queries / objects
+        for stage in stages.itervalues():
+            stage()
+        counts = measure(stages)
+
+        # Time each stage
+        times = dict([(stage, []) for stage in stages])
+        for n in xrange(int(requests)):
+            for stage_name, stage in stages.iteritems():
+                start = default_timer()
+                stage()
+                times[stage_name].append((default_timer() - start) * 1000000)
+
+        # Per-stage results / request total
+        for stage_name in stages:
+            results.append({
+                'request': name,
+                'stage': stage_name,
+                'mean_us': round(sum(times[stage_name]) / len(times[stage_name]), 1),
+                'min_us': round(min(times[stage_name]), 1),
+                'queries': counts[stage_name]['queries'],
+                'objects': counts[stage_name]['objects']
+            })
+        results.append({
+            'request': name,
+            'stage': 'total',
+            'mean_us': round(sum([sum(t) for t in times.itervalues()]) / int(requests), 1),
+            'min_us': round(min([sum(t) for t in zip(*times.values())]), 1),
+            'queries': sum([c['queries'] for c in counts.itervalues()]),
+            'objects': sum([c['objects'] for c in counts.itervalues()])
+        })
+    report('request_pipeline', results, output, requests=int(requests), users=int(users))
+
+if __name__ == '__main__':
+    main(*sys.argv[1:4])
@@ -10,7 +10,6 @@ from os import path, makedirs, system, listdir
 # Lense Libraries
 from lense import import_class
 from lense.common.exceptions import RequestError, EnsureError
-from lense.common.request import LenseWSGIRequest
 from lense.common.config import LenseConfigEditor
 from lense.common.vars import WSGI_CONFIG, PROJECTS, CONFIG, SHARE
 
@@ -326,7 +325,7 @@ class BootstrapCommon(object):
         """
         
         # Setup the request data
-        LENSE.REQUEST.set(LenseWSGIRequest.get(path=path, data=data, method=method))
+        LENSE.REQUEST.set_direct(path, method, data)
         
         # Get the handler object
         handler_mod = None
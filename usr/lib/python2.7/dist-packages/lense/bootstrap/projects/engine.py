@@ -8,7 +8,6 @@ from lense.common.vars import USERS, GROUPS
 from lense.bootstrap.params import EngineParams
 from lense.common.config import LenseConfigEditor
 from lense.bootstrap.common import BootstrapCommon
-from lense.common.request import LenseWSGIRequest
 
 class BootstrapEngine(BootstrapCommon):
     """
@@ -25,7 +24,7 @@ class BootstrapEngine(BootstrapCommon):
         self._connection = None
         
         # Setup the request data
-        LENSE.REQUEST.set(LenseWSGIRequest.get(path='bootstrap', data={}, method=HTTP_GET))
+        LENSE.REQUEST.set_direct('bootstrap', HTTP_GET)
         
     def _try_mysql_root(self):
         """
@@ -9,8 +9,10 @@ from os import environ
 from lense import import_class
 from lense.common.vars import PROJECTS
 from lense.common.base import LenseBase
+from lense.common.context import LenseContext, context_attribute
 from lense import MODULE_ROOT, DROPIN_ROOT
 from lense.common.exceptions import InvalidProjectID, InitializeError, EnsureError
+from lense.common.manifest.resolver import ManifestResolver, VOLATILE
 
 # Drop-in Python path
 path.append(DROPIN_ROOT)
@@ -34,6 +36,7 @@ class LenseSetup(object):
         Setup the Socket.IO proxy server connection.
         """
         LENSE.SOCKET = import_class('LenseSocketIO', 'lense.common.socket')
+        ManifestResolver.invalidate()
         LENSE.SOCKET.set()
 
     @classmethod
@@ -43,6 +46,7 @@ class LenseSetup(object):
         """
         LENSE.REQUEST.set(request)
         LENSE.PORTAL = import_class('PortalInterface', 'lense.portal')
+        ManifestResolver.invalidate()
 
     @classmethod
     def auth(cls):
@@ -50,6 +54,7 @@ class LenseSetup(object):
         Setup Lense authentication backend.
         """
         LENSE.AUTH = import_class('AuthInterface', 'lense.common.auth')
+        ManifestResolver.invalidate()
 
     @classmethod
     def client(cls):
@@ -57,12 +62,22 @@ class LenseSetup(object):
         Setup the Lense client for handling module/CLI level requests.
         """
         LENSE.CLIENT = import_class('ClientInterface', 'lense.client.interface')
+        ManifestResolver.invalidate()
 
 class LenseCommon(LenseBase):
     """
     Common class for creating project specific instances of common libraries,
-    variables, and modules.
+    variables, and modules. Per-request attributes are stored in a thread local
+    context, so each thread handles its own request.
     """
+
+    # Per-request attributes
+    REQUEST  = context_attribute('REQUEST')
+    MANIFEST = context_attribute('MANIFEST')
+    AUTH     = context_attribute('AUTH')
+    SOCKET   = context_attribute('SOCKET')
+    PORTAL   = context_attribute('PORTAL')
+
     def __init__(self, project):
         super(LenseCommon, self).__init__(project)
         
@@ -76,10 +91,21 @@ class LenseCommon(LenseBase):
         def pattr(a):
             return getattr(self.PROJECT, a, False)
         
+        """
+        Request Context
+        """
+        self.CONTEXT     = LenseContext(
+            REQUEST  = lambda: import_class('LenseRequestObject', 'lense.common.request', ensure=pattr('get_request')),
+            MANIFEST = lambda: import_class('LenseManifest', 'lense.common.manifest', init=False),
+            AUTH     = None,
+            SOCKET   = None,
+            PORTAL   = None,
+            API_LOG  = None
+        )
+
         """
         Project Objects
         """      
-        self.REQUEST     = import_class('LenseRequestObject', 'lense.common.request', ensure=pattr('get_request'))
         self.OBJECTS     = import_class('LenseAPIObjects', 'lense.common.objects', ensure=pattr('get_objects'))
         self.SECURITY    = import_class('LenseSecurity', 'lense.common.security')
         self.PERMISSIONS = import_class('LensePermissions', 'lense.common.permissions', init=False)
@@ -90,16 +116,20 @@ class LenseCommon(LenseBase):
         self.HTTP        = import_class('LenseHTTP', 'lense.common.http', init=False)
         self.MAIL        = import_class('LenseAPIEmail', 'lense.common.mailer', init=False)
         self.SETUP       = import_class('LenseSetup', 'lense.common', init=False)
-        self.MANIFEST    = import_class('LenseManifest', 'lense.common.manifest', init=False)
         self.CLIENT      = None
-        self.SOCKET      = None
-        self.PORTAL      = None
         self.ENGINE      = None
-        self.AUTH        = None
         
         # Initialize logs
         self._log_startup()
         
+    def __setattr__(self, name, value):
+        """
+        Discard resolved manifest paths when a stable attribute is rebound.
+        """
+        if not name in VOLATILE and name in self.__dict__:
+            ManifestResolver.rebind(name)
+        super(LenseCommon, self).__setattr__(name, value)
+
     def _log_startup(self):
         """
         Start the logs for this project run.
@@ -1,6 +1,7 @@
 from lense import import_class
 from json import loads as json_loads
 from lense.common.exceptions import RequestError
+from lense.common.context import context_attribute
 
 class LenseAPIRequestMapper(object):
     """
@@ -23,6 +24,9 @@ class LenseAPIRequestMapper(object):
             debug = 'Retrieved handler object for: path={0}, method={1}'.format(path, method),
             code  = 404)
     
+        # Store the mapped handler for the request
+        LENSE.REQUEST.handler = handler.uuid
+
         # Construct the request map object
         return {
             'path':    handler.path,
@@ -36,6 +40,10 @@ class LenseAPIConstructor(object):
     """
     Helper class for constructing API classes.
     """
+
+    # Per-request API logger
+    LOG = context_attribute('API_LOG')
+
     @staticmethod
     def map_request():
         """
@@ -48,4 +56,4 @@ class LenseAPIConstructor(object):
         """
         Initialize the API logger.
         """
-        setattr(LENSE.API, 'LOG', import_class('LenseAPILogger', 'lense.common.logger'))
\ No newline at end of file
+        LENSE.CONTEXT.API_LOG = import_class('LenseAPILogger', 'lense.common.logger')
\ No newline at end of file
@@ -1,13 +1,18 @@
 from re import compile
 from lense import import_class
+from lense.common.utils import cached_attribute, log_enabled, log_message
 from lense.common.exceptions import AuthError
 
 class AuthBase(object):
     """
     Base object for authentication classes.
     """
-    def __init__(self):
-        self.logpre = '<AUTH:{0}:{1}@{2}>'.format(
+    @cached_attribute
+    def logpre(self):
+        """
+        Log prefix, built on first use to avoid loading the request user.
+        """
+        return '<AUTH:{0}:{1}@{2}>'.format(
             self.__class__.__name__, 
             LENSE.REQUEST.USER.name, 
             LENSE.REQUEST.client
@@ -15,10 +20,13 @@ class AuthBase(object):
         
     def log(self, msg, level='info'):
         """
-        Log wrapper per handler.
+        Log wrapper per handler. The message may be a method returning the message,
+        which is only called if the log level is enabled.
         """
-        logger = getattr(LENSE.LOG, level, 'info')
-        logger('{0} {1}'.format(self.logpre, msg))
+        if not log_enabled(level):
+            return
+        logger = getattr(LENSE.LOG, level, LENSE.LOG.info)
+        logger('{0} {1}'.format(self.logpre, log_message(msg)))
 
     def ensure(self, *args, **kwargs):
         """
@@ -33,13 +41,26 @@ class AuthInterface(AuthBase):
     """
     Lense authentication interface.
     """
-    def __init__(self):
-        super(AuthInterface, self).__init__()
-        
-        # Key / token / portal authentication
-        self._key    = import_class('AuthAPIKey', 'lense.common.auth.key')
-        self._token  = import_class('AuthAPIToken', 'lense.common.auth.token')
-        self._portal = import_class('AuthPortal', 'lense.common.auth.portal')
+    @cached_attribute
+    def _key(self):
+        """
+        Key authentication.
+        """
+        return import_class('AuthAPIKey', 'lense.common.auth.key')
+
+    @cached_attribute
+    def _token(self):
+        """
+        Token authentication.
+        """
+        return import_class('AuthAPIToken', 'lense.common.auth.token')
+
+    @cached_attribute
+    def _portal(self):
+        """
+        Portal authentication.
+        """
+        return import_class('AuthPortal', 'lense.common.auth.portal')
         
     def check_pw_strength(self, passwd):
         """
@@ -92,9 +92,8 @@ class AuthBackendInterface(ModelBackend):
         """
         Check if the user is pulled from the LDAP server.
         """
-        if self.user_model.objects.filter(username=username).count():
-            return self.user_model.objects.get(username=username).from_ldap
-        return None
+        from_ldap = self.user_model.objects.filter(username=username).values_list('from_ldap', flat=True)[:1]
+        return from_ldap[0] if from_ldap else None
     
     def _authenticate_ldap(self, username, password):
         """
@@ -183,7 +182,7 @@ class AuthBackendInterface(ModelBackend):
         if LENSE.CONF.auth.backend == 'ldap':
             
             # If the user doesn't exist
-            if not self.user_model.objects.filter(username=username).count():
+            if not self.user_model.objects.filter(username=username).exists():
                 
                 # Attempt user authentication
                 return self._authenticate_ldap(username, password)
@@ -0,0 +1,227 @@
+from time import time
+from threading import RLock
+from collections import OrderedDict
+
+class LenseCache(object):
+    """
+    Thread safe, process level key/value cache with optional LRU eviction
+    and expiration.
+    """
+    def __init__(self, name, maxsize=None, ttl=None, removed=None):
+        """
+        :param    name: The cache name used when reporting statistics
+        :type     name: str
+        :param maxsize: The maximum number of entries before evicting the least recently used
+        :type  maxsize: int
+        :param     ttl: The number of seconds before an entry expires
+        :type      ttl: int|float
+        :param removed: Called with the key and value of each entry evicted, expired, deleted or purged
+        :type  removed: callable
+        """
+        self.name      = name
+        self.maxsize   = maxsize
+        self.ttl       = ttl
+        self.removed   = removed
+
+        # Cache entries: key -> (expires, value)
+        self._entries  = OrderedDict()
+        self._lock     = RLock()
+
+        # Cache counters
+        self.hits      = 0
+        self.misses    = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return '<{0}({1})>'.format(self.__class__.__name__, self.name)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self.get(key, count=False) is not None
+
+    def _notify(self, entries):
+        """
+        Pass removed entries to the removal callback, outside of the cache lock.
+
+        :param entries: The removed (key, value) pairs
+        :type  entries: list
+        """
+        if self.removed:
+            for key, value in entries:
+                self.removed(key, value)
+
+    def get(self, key, default=None, count=True):
+        """
+        Retrieve a cached value, marking the entry as recently used.
+
+        :param     key: The cache key
+        :type      key: hashable
+        :param default: The value to return on a cache miss
+        :type  default: mixed
+        :param   count: Update the hit/miss counters
+        :type    count: bool
+        :rtype: mixed
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            # Cache hit, move to the most recently used position
+            if entry is not None and not (entry[0] and entry[0] < time()):
+                if self.maxsize:
+                    del self._entries[key]
+                    self._entries[key] = entry
+                if count:
+                    self.hits += 1
+                return entry[1]
+
+            # Cache miss or expired entry
+            if entry is not None:
+                del self._entries[key]
+            if count:
+                self.misses += 1
+
+        # Expired entry removed
+        if entry is not None:
+            self._notify([(key, entry[1])])
+        return default
+
+    def set(self, key, value, ttl=None):
+        """
+        Store a value in the cache.
+
+        :param   key: The cache key
+        :type    key: hashable
+        :param value: The value to store
+        :type  value: mixed
+        :param   ttl: Override the default entry lifetime in seconds
+        :type    ttl: int|float
+        """
+        ttl     = self.ttl if ttl is None else ttl
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                del self._entries[key]
+            self._entries[key] = ((time() + ttl) if ttl else None, value)
+
+            # Evict least recently used entries
+            while self.maxsize and len(self._entries) > self.maxsize:
+                k, entry = self._entries.popitem(last=False)
+                evicted.append((k, entry[1]))
+                self.evictions += 1
+        self._notify(evicted)
+        return value
+
+    def delete(self, key):
+        """
+        Remove a single cache entry if it exists.
+
+        :param key: The cache key
+        :type  key: hashable
+        :rtype: int
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None:
+            return 0
+        self._notify([(key, entry[1])])
+        return 1
+
+    def purge(self, match=None):
+        """
+        Remove all cache entries, or only entries whose key satisfies a filter.
+
+        :param match: An optional filter method accepting the entry key
+        :type  match: callable
+        :rtype: int
+        """
+        with self._lock:
+            keys   = [k for k in self._entries.iterkeys() if match is None or match(k)]
+            purged = [(k, self._entries.pop(k)[1]) for k in keys]
+        self._notify(purged)
+        return len(purged)
+
+    def stats(self):
+        """
+        Return cache statistics.
+
+        :rtype: dict
+        """
+        return {
+            'name': self.name,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+class LenseTTLCache(object):
+    """
+    Base class for optional, process wide caches whose entry lifetime is set by
+    an engine configuration key. Caching is disabled unless the key is set.
+    """
+    CACHE  = None
+    CONFIG = None
+
+    @classmethod
+    def ttl(cls):
+        """
+        Return the configured entry lifetime in seconds.
+
+        :rtype: int|float
+        """
+        return getattr(LENSE.CONF.engine, cls.CONFIG, 0)
+
+    @classmethod
+    def get(cls, key):
+        """
+        Retrieve a cached value.
+
+        :param key: The cache key
+        :type  key: hashable
+        :rtype: mixed
+        """
+        if not cls.ttl():
+            return None
+        return cls.CACHE.get(key)
+
+    @classmethod
+    def store(cls, key, value):
+        """
+        Store a value if caching is enabled.
+
+        :param   key: The cache key
+        :type    key: hashable
+        :param value: The value to store
+        :type  value: mixed
+        :rtype: mixed
+        """
+        ttl = cls.ttl()
+        if not ttl:
+            return value
+        return cls.CACHE.set(key, value, ttl=ttl)
+
+    @classmethod
+    def invalidate(cls, key=None):
+        """
+        Invalidate a cached value, or all values if no key is specified.
+
+        :param key: The cache key
+        :type  key: hashable
+        :rtype: int
+        """
+        if key is None:
+            return cls.CACHE.purge()
+        return cls.CACHE.delete(key)
+
+    @classmethod
+    def stats(cls):
+        """
+        Return cache statistics.
+
+        :rtype: dict
+        """
+        return cls.CACHE.stats()
@@ -3,6 +3,12 @@ import json
 from collections import namedtuple
 from types import InstanceType, ClassType
 
+# Django QueryDict, if available
+try:
+    from django.http.request import QueryDict
+except ImportError:
+    QueryDict = None
+
 def merge_dict(a, b, path=None):
         """
         Merge two dictionaries together. Do not overwrite duplicate keys.
@@ -27,23 +33,41 @@ def merge_dict(a, b, path=None):
                 a[key] = b[key]
         return a
 
+def is_query_dict(obj):
+    """
+    Check if an object is a Django QueryDict.
+    
+    :param obj: The object to check
+    :type obj: *
+    :rtype: boolean
+    """
+    return QueryDict is not None and isinstance(obj, QueryDict)
+
 class Collection(object):
     """
     Construct an immutable collection from a dictionary.
     """
-    def __init__(self, init_data=None):
+    
+    # Cached record types: (class name, keys) -> namedtuple
+    TYPES     = {}
+    TYPES_MAX = 1024
+    
+    def __init__(self, init_data=None, cached=False):
         """
         Initialize a new collection object.
         
         :param init_data: An optional dictionary used to initialize the collection
         :type init_data: dict
+        :param cached: Build records directly using cached record types
+        :type cached: boolean
         """
         self.class_name = self.__class__.__name__
+        self.cached     = cached
         if init_data:
             if isinstance(init_data, dict):
                 
                 # Check if creating a collection from a Django QueryDict
-                if re.match(r'^<QueryDict.*$', str(init_data)):
+                if is_query_dict(init_data):
                     self.collection = self._convert_query_dict(init_data)
                 else:
                     self.collection = init_data
@@ -98,7 +122,7 @@ class Collection(object):
         else:
            
             # Check if mapping a Django QueryDict
-            if re.match(r'^<QueryDict.*$', str(map_dict)):
+            if is_query_dict(map_dict):
                 self.collection = merge_dict(self._convert_query_dict(map_dict), self.collection)
             else:
                 self.collection = merge_dict(map_dict, self.collection)
@@ -124,6 +148,43 @@ class Collection(object):
         if ((hasattr(obj, '__class__')) and (re.match(r'^<class \'lense\..*\.{0}\'>$'.format(cls), repr(obj.__class__)))):
             return True
         return False
+    
+    @classmethod
+    def record_type(cls, name, keys):
+        """
+        Retrieve the named tuple type for a set of keys, creating and caching
+        the type on first use. Types are cached until the cache is full.
+        
+        :param name: The record type name
+        :type name: str
+        :param keys: The record keys
+        :type keys: list
+        :rtype: type
+        """
+        type_key = (name, frozenset(keys))
+        try:
+            return cls.TYPES[type_key]
+        except KeyError:
+            record = namedtuple(name, keys)
+            if len(cls.TYPES) < cls.TYPES_MAX:
+                cls.TYPES[type_key] = record
+            return record
+    
+    def record(self, value):
+        """
+        Recursively convert dictionaries to named tuples, including any
+        dictionaries in lists. Other values are returned unchanged.
+        
+        :param value: The value to convert
+        :type value: *
+        :rtype: *
+        """
+        if isinstance(value, dict):
+            record = self.record_type(self.class_name, value.keys())
+            return record(*[self.record(value[k]) for k in record._fields])
+        if isinstance(value, (list, tuple)):
+            return [self.record(v) for v in value]
+        return value
        
     def get(self):
         """
@@ -149,8 +210,15 @@ class Collection(object):
             # Get subkey2
             print newcol.key1.subkey2
         
+        Cached collections build records directly, reusing the named tuple type
+        for each set of keys, instead of a JSON round trip creating a new type
+        for every dictionary. Values are not converted to JSON types.
+        
         :rtype: namedtuple
         """
+        if self.cached:
+            return self.record(self.collection)
+        
         def obj_mapper(d):
             """
             Map a dictionary to a named tuple object based on dictionary keys
@@ -176,12 +244,14 @@ class Collection(object):
             return json.loads(data, object_hook=obj_mapper)
     
     @classmethod
-    def create(cls, data):
+    def create(cls, data, cached=False):
         """
         Create a new collection.
         
-        :param data: The source dictionary
-        :type  data: dict
+        :param   data: The source dictionary
+        :type    data: dict
+        :param cached: Build records directly using cached record types
+        :type  cached: bool
         :rtype: namedtuple
         """
-        return cls(data).get()
\ No newline at end of file
+        return cls(data, cached=cached).get()
\ No newline at end of file
@@ -85,7 +85,7 @@ class _LenseConfig(object):
                             usr_config[section][key] = value
     
         # Parse the configuration file
-        return Collection(usr_config).get()
+        return Collection(usr_config, cached=True).get()
     
 def parse(config_id=None):
     """
@@ -0,0 +1,59 @@
+from threading import local
+
+class LenseContext(local):
+    """
+    Per-thread request context. Each thread gets its own copy of the context
+    attributes, created from the attribute factories on first use in that
+    thread. Under gevent, monkey patching makes the context greenlet local.
+    """
+    def __init__(self, **factories):
+        """
+        :param factories: Context attribute names and factory methods for each thread
+        :type  factories: dict
+        """
+        for name, factory in factories.iteritems():
+            setattr(self, name, None if not factory else factory())
+
+    def snapshot(self):
+        """
+        Return the context attributes for the current thread.
+
+        :rtype: dict
+        """
+        return dict(self.__dict__)
+
+    def restore(self, snapshot):
+        """
+        Restore context attributes into the current thread, i.e. to share the
+        caller's request with a worker thread.
+
+        :param snapshot: Context attributes returned by snapshot()
+        :type  snapshot: dict
+        """
+        self.__dict__.update(snapshot)
+
+    def clear(self):
+        """
+        Discard the context attributes of the current thread, i.e. when a worker
+        thread finishes running on behalf of a request.
+        """
+        self.__dict__.clear()
+
+class context_attribute(object):
+    """
+    Data descriptor proxying an attribute to the per-thread request context.
+    On a class, the attribute is read from the context of the global commons.
+    """
+    def __init__(self, name):
+        """
+        :param name: The context attribute name
+        :type  name: str
+        """
+        self.name = name
+
+    def __get__(self, instance, owner):
+        context = LENSE.CONTEXT if instance is None else instance.CONTEXT
+        return getattr(context, self.name, None)
+
+    def __set__(self, instance, value):
+        setattr(instance.CONTEXT, self.name, value)
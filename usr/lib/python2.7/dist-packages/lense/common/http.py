@@ -2,6 +2,18 @@ from __future__ import print_function
 import sys
 import json
 import traceback
+from urllib import unquote
+from six import string_types
+from collections import namedtuple
+
+# Fast JSON decoder if available
+try:
+    from ujson import loads as json_decode
+except ImportError:
+    try:
+        from simplejson import loads as json_decode
+    except ImportError:
+        from json import loads as json_decode
 
 # Django Libraries
 from django.core.serializers.json import DjangoJSONEncoder
@@ -32,22 +44,44 @@ PATH = Collection({
     'GET_TOKEN':    'token'
 }).get()
 
+# Headers stored in the WSGI environment without the HTTP_ prefix
+WSGI_HEADERS = ['CONTENT_TYPE', 'CONTENT_LENGTH']
+
+def _header_meta(header):
+    """
+    Build the request META key for a header name.
+    """
+    key = header.upper().replace('-', '_')
+    return key if key in WSGI_HEADERS else 'HTTP_{0}'.format(key)
+
 # Format Lense header
 def HEADER_FORMAT(header):
-    return 'HTTP_{0}'.format(header.upper().replace('-', '_'))
+    try:
+        return HEADER_META[header]
+    except KeyError:
+        return _header_meta(header)
 
 # HTTP Headers
 HEADER = Collection({
-    'API_USER':     'Lense-API-User',
-    'API_KEY':      'Lense-API-Key',
-    'API_TOKEN':    'Lense-API-Token',
-    'API_GROUP':    'Lense-API-Group',
-    'API_ROOM':     'Lense-API-Room',
-    'API_CALLBACK': 'Lense-API-Callback',
-    'CONTENT_TYPE': 'Content-Type',
-    'ACCEPT':       'Accept'
+    'API_USER':       'Lense-API-User',
+    'API_KEY':        'Lense-API-Key',
+    'API_TOKEN':      'Lense-API-Token',
+    'API_GROUP':      'Lense-API-Group',
+    'API_ROOM':       'Lense-API-Room',
+    'API_CALLBACK':   'Lense-API-Callback',
+    'API_TRACE':      'Lense-API-Trace',
+    'CONTENT_TYPE':   'Content-Type',
+    'CONTENT_LENGTH': 'Content-Length',
+    'ACCEPT':         'Accept'
 }).get()
 
+# Request META keys for each header
+HEADER_META = dict([(h, _header_meta(h)) for h in HEADER])
+
+# Immutable view of the Lense headers for a request / META keys in field order
+RequestHeaders = namedtuple('RequestHeaders', HEADER._fields)
+REQUEST_HEADERS = [HEADER_META[getattr(HEADER, f)] for f in RequestHeaders._fields]
+
 # MIME Types
 MIME_TYPE = Collection({
     'TEXT': {
@@ -75,10 +109,14 @@ MIME_TYPE = Collection({
         'PDF':          'application/pdf',
         'ZIP':          'application/zip',
         'GZIP':         'application/gzip',
-        'JAVASCRIPT':   'application/javascript'
+        'JAVASCRIPT':   'application/javascript',
+        'FORM':         'application/x-www-form-urlencoded'
     }
 }).get()
 
+# Leading characters of JSON values
+JSON_START = frozenset('{["-0123456789tfnNI')
+
 class JSONSuccess(object):
     """
     Base class for successfull request responses.
@@ -93,6 +131,11 @@ class JSONSuccess(object):
         if LENSE.REQUEST.callback:
             response['callback'] = LENSE.REQUEST.callback
 
+        # Manifest execution trace for this request
+        trace = getattr(LENSE.MANIFEST, 'TRACE', None)
+        if LENSE.CONF.engine.debug and trace and trace.request == LENSE.REQUEST.uuid:
+            response['trace'] = trace.render()
+
         # Response body
         self.body = json.dumps(response, cls=DjangoJSONEncoder)
 
@@ -177,9 +220,84 @@ class LenseHTTP(object):
     Common class for handling HTTP attributes, requests, and responses.
     """
     @staticmethod
-    def parse_query_string(query_str):
+    def content_type(meta):
+        """
+        Return the media type of a request without parameters.
+
+        :param meta: The request META dictionary
+        :type  meta: dict
+        :rtype: str
+        """
+        return meta.get('CONTENT_TYPE', '').split(';', 1)[0].strip().lower()
+
+    @staticmethod
+    def headers(meta):
+        """
+        Extract the Lense headers from a request in a single pass. Missing
+        headers are set to None.
+
+        :param meta: The request META dictionary
+        :type  meta: dict
+        :rtype: RequestHeaders
+        """
+        return RequestHeaders(*[meta.get(k) for k in REQUEST_HEADERS])
+
+    @staticmethod
+    def parse_value(value):
+        """
+        Parse a single query string value as JSON, an integer, or a string.
+
+        :param value: The raw query string value
+        :type  value: str
+        :rtype: mixed
+        """
+
+        # JSON value
+        if value.lstrip()[:1] in JSON_START:
+            try:
+                return json_decode(value)
+            except ValueError:
+                pass
+
+        # Integer value
+        digits = value.strip()
+        if digits[1:].isdigit() if digits[:1] in '+-' else digits.isdigit():
+            return int(digits)
+
+        # String value
+        return value
+
+    @staticmethod
+    def decode_value(value):
+        """
+        Decode a URL encoded string value, mapping boolean strings to booleans.
+
+        :param value: The value to decode
+        :type  value: mixed
+        :rtype: mixed
+        """
+        if not isinstance(value, string_types):
+            return value
+
+        # Boolean string
+        if value in ['True', 'False']:
+            return value == 'True'
+
+        # Unquote as UTF-8 bytes
+        if isinstance(value, unicode):
+            value = value.encode('utf8')
+        return unquote(value).decode('utf8')
+
+    @classmethod
+    def parse_query_string(cls, query_str, decode=False):
         """
         Parse request data from a query string in the request URL.
+
+        :param query_str: The query string
+        :type  query_str: str
+        :param    decode: URL decode string values and map boolean strings
+        :type     decode: bool
+        :rtype: dict
         """
         data = {}
 
@@ -188,29 +306,16 @@ class LenseHTTP(object):
 
         # Process each query string key
         for query_pair in query_str.split('&'):
-
-            # If processing a key/value pair
-            if '=' in query_pair:
-                query_set = query_pair.split('=')
-
-                # Return JSON if possible
-                try:
-                    data[query_set[0]] = json.loads(query_set[1])
-
-                # Non-JSON parseable value
-                except:
-
-                    # Integer value
-                    try:
-                        data[query_set[0]] = int(query_set[1])
-
-                    # String value
-                    except:
-                        data[query_set[0]] = query_set[1]
+            key, sep, value = query_pair.partition('=')
 
             # If processing a key flag
-            else:
-                data[query_pair] = True
+            if not sep:
+                data[key] = True
+                continue
+
+            # Key/value pair
+            value = cls.parse_value(value)
+            data[key] = value if not decode else cls.decode_value(value)
 
         # Return constructed data
         return data
@@ -2,39 +2,35 @@ from six import string_types, integer_types
 
 # Lense Libraries
 from lense import import_class
+from lense.common.http import HTTP_GET
 from lense.common.exceptions import ManifestError
+from lense.common.manifest.resolver import ManifestResolver
 
 class LenseManifest(object):
     """
     Commons interface class for compiling and executing manifests.
     """
-    def __init__(self, manifest):
-        self.json     = manifest
-        self.VALIDATE = import_class('ManifestValidate', 'lense.common.manifest.validate')
-        self.COMPILED = import_class('CompiledManifest', 'lense.common.manifest.compiled')
-        self.MANAGER  = import_class('ManifestManager', 'lense.common.manifest.manager')
+    def __init__(self, manifest, handler=None):
+        self.json      = manifest
+        self.handler   = handler
+        self.CACHE     = import_class('ManifestCache', 'lense.common.manifest.cache', init=False)
+        self.RESPONSES = import_class('ManifestResponseCache', 'lense.common.manifest.cache', init=False)
+        self.RESOLVER  = ManifestResolver
+        self.TRACER    = import_class('ManifestTracer', 'lense.common.manifest.tracer', init=False)
+        self.BATCH     = import_class('ManifestBatch', 'lense.common.manifest.batch', init=False)
+        self.VALIDATE  = import_class('ManifestValidate', 'lense.common.manifest.validate')
+        self.COMPILED  = import_class('CompiledManifest', 'lense.common.manifest.compiled')
+        self.MANAGER   = import_class('ManifestManager', 'lense.common.manifest.manager')
+
+        # Compiled manifest content hash / execution trace for the current request
+        self.digest    = None
+        self.TRACE     = None
 
     def mapCommon(self, path):
         """
-        Map to a commons object.
+        Map to a commons object, resolved paths are cached by the resolver.
         """
-        paths  = path.split('.')
-        mapped = LENSE
-        for p in paths:
-
-            # Root namespace
-            if p == 'LENSE':
-                continue
-
-            # Make sure mapping key exists
-            if not hasattr(mapped, p):
-                raise ManifestError('Invalid mapping path: {0}'.format(path))
-
-            # Store the next mapping
-            mapped = getattr(mapped, p)
-
-        # Return the mapped path
-        return mapped
+        return ManifestResolver.resolve(path)
 
     def mapReference(self, key):
         """
@@ -62,14 +58,23 @@ class LenseManifest(object):
         if not LENSE.MANIFEST.COMPILED.haskey(key):
             raise ManifestError('Variable contains an undefined key reference: {0}'.format(key))
 
+        refobj = self.COMPILED.get(key)
+
+        # Deferred variable in lazy mode
+        if refobj.state == 'compiled' and refobj.type == 'var' and self.COMPILED.options.get('execute') == 'lazy':
+            self.MANAGER.force(refobj)
+
+        # Circular reference between deferred variables
+        elif refobj.state == 'evaluating':
+            raise ManifestError('Variable contains a circular key reference: {0}'.format(key))
+
         # Object keys
         if objkeys:
-            top    = self.COMPILED.get(key).value
-            refval = LENSE.OBJECTS.walkattr(top, objkeys)
+            refval = LENSE.OBJECTS.walkattr(refobj.value, objkeys)
 
         # Top level reference
         else:
-            refval = self.COMPILED.get(key).value
+            refval = refobj.value
 
         # Return the value
         return refval
@@ -91,17 +96,18 @@ class LenseManifest(object):
         Abstract method for mapping both args and kwargs objects.
         """
 
-        # Mapping is iterable
+        # Mapping is iterable (map into a copy, compiled attributes may be shared)
         if isinstance(walk, (list, dict)):
+            mapped = list(walk) if isinstance(walk, list) else dict(walk)
             for k,v in (enumerate(walk) if isinstance(walk, list) else walk.iteritems()):
 
                 # Boolean value
                 if isinstance(v, bool) or v is None:
-                    walk[k] = v
+                    mapped[k] = v
 
                 # Number value
                 elif isinstance(v, integer_types):
-                    walk[k] = v
+                    mapped[k] = v
 
                 # Nested keyword arguments
                 elif isinstance(v, dict):
@@ -111,25 +117,25 @@ class LenseManifest(object):
                         exec_method = self.execCommon if v['call'].startswith('LENSE') else self.execReference
                         exec_method(v['call'], v.get('args', []), v.get('kwargs', {}))
                     else:
-                        walk[k] = self.mapInner(v)
+                        mapped[k] = self.mapInner(v)
 
                 # Nested arguments
                 elif isinstance(v, list):
-                    walk[k] = self.mapInner(v)
+                    mapped[k] = self.mapInner(v)
 
                 # Reference
                 else:
 
                     # Internal reference
                     if v.startswith('#'):
-                        walk[k] = self.mapReference(v[1:])
+                        mapped[k] = self.mapReference(v[1:])
 
                     # Commons reference
                     if v.startswith('LENSE'):
-                        walk[k] = self.mapCommon(v)
+                        mapped[k] = self.mapCommon(v)
 
             # Return mapped arguments
-            return walk
+            return mapped
 
         # Map reference
         elif walk.startswith('#'):
@@ -160,12 +166,52 @@ class LenseManifest(object):
         return self.mapInner(kwargs)
 
     @classmethod
-    def setup(cls, manifest):
+    def setup(cls, manifest, handler=None):
         """
         Class method for setting up the manifest backend.
+
+        :param manifest: The manifest JSON object
+        :type  manifest: list
+        :param  handler: The UUID of the handler that owns the manifest
+        :type   handler: str
         """
         LENSE.LOG.info('@MANIFEST:setup, path={0}, method={1}, request_uuid={2}'.format(LENSE.REQUEST.path, LENSE.REQUEST.method, LENSE.REQUEST.uuid))
-        LENSE.MANIFEST = cls(manifest)
+        LENSE.MANIFEST = cls(manifest, handler)
+
+        # Manifest swapped, invalidate per-request paths
+        ManifestResolver.invalidate()
+
+    @classmethod
+    def dispatch(cls, path, method=HTTP_GET, data=None, user=None):
+        """
+        Dispatch a request to a handler manifest in-process, i.e. for internal
+        service calls. The request is set up directly from the arguments and
+        the caller's request context is restored afterwards.
+
+        :param   path: The handler path
+        :type    path: str
+        :param method: The handler method
+        :type  method: str
+        :param   data: The request data
+        :type    data: dict
+        :param   user: The API user making the request
+        :type    user: str
+        :rtype: mixed
+        """
+        context = LENSE.CONTEXT.snapshot()
+        try:
+            LENSE.REQUEST = type(LENSE.REQUEST)()
+            LENSE.REQUEST.set_direct(path.strip('/'), method, data, user)
+
+            # Resolve and execute the handler manifest
+            handler, manifest = import_class('ManifestBatch', 'lense.common.manifest.batch', init=False).handler(LENSE.REQUEST.path, method)
+            cls.setup(manifest, handler)
+            return LENSE.MANIFEST.MANAGER.execute()
+
+        # Restore the caller's request
+        finally:
+            LENSE.CONTEXT.restore(context)
+            ManifestResolver.invalidate()
 
     @classmethod
     def compile(cls, dump):
@@ -0,0 +1,168 @@
+from six import string_types
+
+# Django Libraries
+from django.db import transaction
+
+# Lense Libraries
+from lense.common.http import HTTP_METHODS
+from lense.common.exceptions import EnsureError, RequestError
+from lense.common.manifest.resolver import ManifestResolver
+
+class BatchRollback(Exception):
+    """
+    Roll back an atomic batch after a failed operation.
+    """
+    pass
+
+class ManifestBatch(object):
+    """
+    Execute many handler manifests in a single request. Authentication is done
+    once for the batch request, handlers are resolved once per path/method, and
+    all operations share a database transaction with a savepoint per operation.
+    """
+    @staticmethod
+    def operation(op):
+        """
+        Normalize a batch operation.
+
+        :param op: The operation, either a (path, method, data) list or a dictionary
+        :type  op: list|dict
+        :rtype: tuple
+        """
+        if isinstance(op, dict):
+            op = [op.get('path'), op.get('method'), op.get('data', {})]
+
+        # Operation must be a (path, method[, data]) list
+        if not isinstance(op, (list, tuple)) or not len(op) in [2, 3]:
+            raise RequestError('Batch operation must be a [path, method, data] list or dictionary', code=400)
+        path, method, data = (list(op) + [{}])[:3]
+
+        # Validate the operation attributes
+        if not isinstance(path, string_types) or not method in HTTP_METHODS:
+            raise RequestError('Invalid batch operation: path={0}, method={1}'.format(path, method), code=400)
+        if not isinstance(data, dict):
+            raise RequestError('Batch operation data must be a dictionary', code=400)
+        return path.strip('/'), method, data
+
+    @staticmethod
+    def handler(path, method):
+        """
+        Resolve the handler UUID and manifest for a path/method.
+
+        :param   path: The request path
+        :type    path: str
+        :param method: The request method
+        :type  method: str
+        :rtype: tuple
+        """
+        handler = LENSE.OBJECTS.HANDLER.get(path=path, method=method)
+
+        # Handler must exist and be accessible
+        if not handler or isinstance(handler, list):
+            raise RequestError('Could not find handler: {0}@{1}'.format(method, path), code=404)
+
+        # Handler must be enabled and executable
+        if not handler.enabled:
+            raise RequestError('Handler is disabled: {0}@{1}'.format(method, path), code=403)
+        if not LENSE.PERMISSIONS.can_exec(handler):
+            raise RequestError('Access denied to handler: {0}@{1}'.format(method, path), code=403)
+
+        # Handler must have a manifest
+        if not handler.manifest:
+            raise RequestError('Handler has no manifest: {0}@{1}'.format(method, path), code=400)
+        return handler.uuid, handler.manifest
+
+    @classmethod
+    def execute(cls, handler, manifest, path, method, data):
+        """
+        Execute a single handler manifest with its own request data.
+
+        :param  handler: The handler UUID
+        :type   handler: str
+        :param manifest: The handler manifest
+        :type  manifest: list
+        :param     path: The operation path
+        :type      path: str
+        :param   method: The operation method
+        :type    method: str
+        :param     data: The operation request data
+        :type      data: dict
+        :rtype: mixed
+        """
+        LENSE.REQUEST.path   = path
+        LENSE.REQUEST.method = method
+        LENSE.REQUEST.data   = data
+        LENSE.MANIFEST.setup(manifest, handler)
+        return LENSE.MANIFEST.MANAGER.execute()
+
+    @classmethod
+    def run(cls, operations, atomic=False):
+        """
+        Run a list of batch operations.
+
+        :param operations: A list of (path, method, data) operations
+        :type  operations: list
+        :param     atomic: Roll back every operation if any operation fails
+        :type      atomic: bool
+        :rtype: list
+        """
+        limit = getattr(LENSE.CONF.engine, 'batch_max', 1000)
+        if len(operations) > limit:
+            raise RequestError('Batch exceeds the maximum of {0} operations'.format(limit), code=413)
+
+        # Batch request attributes / resolved handlers
+        request  = (LENSE.MANIFEST, LENSE.REQUEST.path, LENSE.REQUEST.method, LENSE.REQUEST.data)
+        handlers = {}
+        results  = []
+
+        try:
+            with transaction.atomic():
+                for i, op in enumerate(operations):
+                    result = {'index': i}
+                    results.append(result)
+                    try:
+                        path, method, data = cls.operation(op)
+                        result.update({'path': path, 'method': method})
+
+                        # Cannot nest batch requests
+                        if (path, method) == (request[1], request[2]):
+                            raise RequestError('Cannot nest batch requests', code=400)
+
+                        # Resolve the handler once per path/method
+                        if not (path, method) in handlers:
+                            handlers[(path, method)] = cls.handler(path, method)
+                        handler, manifest = handlers[(path, method)]
+
+                        # Execute in a savepoint
+                        with transaction.atomic():
+                            response = cls.execute(handler, manifest, path, method, data)
+                        result.update({
+                            'status': 200,
+                            'message': response.get('message') if isinstance(response, dict) else None,
+                            'data': response.get('data') if isinstance(response, dict) else response
+                        })
+
+                    # Operation failed
+                    except Exception as e:
+                        result.update({
+                            'status': getattr(e, 'code', 500) if isinstance(e, EnsureError) else 500,
+                            'error': str(e)
+                        })
+                        LENSE.LOG.exception('Batch operation {0} failed: {1}'.format(i, str(e)))
+
+                        # Abort the batch
+                        if atomic:
+                            raise BatchRollback()
+
+        # Atomic batch rolled back
+        except BatchRollback:
+            for result in results[:-1]:
+                result.pop('message', None)
+                result.update({'status': 409, 'error': 'Rolled back', 'data': None})
+
+        # Restore the batch request
+        finally:
+            LENSE.MANIFEST = request[0]
+            LENSE.REQUEST.path, LENSE.REQUEST.method, LENSE.REQUEST.data = request[1:]
+            ManifestResolver.invalidate()
+        return results
@@ -0,0 +1,210 @@
+from hashlib import sha1
+from copy import deepcopy
+from threading import RLock
+from json import dumps as jsonDump
+
+# Lense Libraries
+from lense.common.cache import LenseCache
+
+class ManifestCache(object):
+    """
+    Process wide cache of compiled manifest templates, keyed by the handler UUID
+    and a hash of the manifest contents.
+    """
+    CACHE = LenseCache('manifests', maxsize=512)
+
+    @staticmethod
+    def digest(manifest):
+        """
+        Generate a content hash for a manifest JSON object.
+
+        :param manifest: The manifest JSON object
+        :type  manifest: list
+        :rtype: str
+        """
+        return sha1(jsonDump(manifest, sort_keys=True)).hexdigest()
+
+    @classmethod
+    def get(cls, handler, digest):
+        """
+        Retrieve a compiled manifest template.
+
+        :param handler: The handler UUID
+        :type  handler: str
+        :param  digest: The manifest content hash
+        :type   digest: str
+        :rtype: CompiledTemplate|None
+        """
+        return cls.CACHE.get((handler, digest))
+
+    @classmethod
+    def store(cls, template):
+        """
+        Store a compiled manifest template, replacing templates compiled from
+        previous versions of the handler manifest. Templates without a handler
+        are keyed by their digest alone and never replace other templates.
+
+        :param template: The compiled manifest template
+        :type  template: CompiledTemplate
+        :rtype: CompiledTemplate
+        """
+        if template.handler is not None:
+            cls.CACHE.purge(lambda k: k[0] == template.handler and not k[1] == template.digest)
+        return cls.CACHE.set(template.key, template)
+
+    @classmethod
+    def invalidate(cls, handler=None):
+        """
+        Invalidate compiled templates for a handler, or all templates if no
+        handler is specified.
+
+        :param handler: The handler UUID
+        :type  handler: str
+        :rtype: int
+        """
+        if handler is None:
+            return cls.CACHE.purge()
+        return cls.CACHE.purge(lambda k: k[0] == handler)
+
+    @classmethod
+    def stats(cls):
+        """
+        Return compiled manifest cache statistics.
+
+        :rtype: dict
+        """
+        return cls.CACHE.stats()
+
+
+class ManifestResponseCache(object):
+    """
+    Process wide cache of manifest responses for idempotent requests, keyed by
+    the handler UUID, manifest digest, normalized request data and the
+    requesting user/group.
+    Entries are tagged with the object models read while building the response,
+    and their tags are released when the entry is evicted, expires or is deleted.
+    """
+    CACHE      = LenseCache('responses', maxsize=1024, removed=lambda k, v: ManifestResponseCache.untag(k, v[1]))
+
+    # Model tag -> cache keys / invalidation generation
+    TAGS       = {}
+    LOCK       = RLock()
+    GENERATION = [0]
+
+    @staticmethod
+    def key(handler, digest, data):
+        """
+        Generate a response cache key for the current request.
+
+        :param handler: The handler UUID
+        :type  handler: str
+        :param  digest: The compiled manifest content hash
+        :type   digest: str
+        :param    data: The request data
+        :type     data: dict
+        :rtype: tuple
+        """
+        return (handler, digest, jsonDump(data, sort_keys=True, default=str), LENSE.REQUEST.USER.name, LENSE.REQUEST.USER.group)
+
+    @classmethod
+    def generation(cls):
+        """
+        Return the current invalidation generation.
+
+        :rtype: int
+        """
+        return cls.GENERATION[0]
+
+    @classmethod
+    def get(cls, key):
+        """
+        Retrieve a copy of a cached response.
+
+        :param key: The response cache key
+        :type  key: tuple
+        :rtype: mixed
+        """
+        entry = cls.CACHE.get(key)
+        return None if entry is None else deepcopy(entry[0])
+
+    @classmethod
+    def untag(cls, key, tags):
+        """
+        Release the model tags of a removed response, keeping any tags held by
+        a response stored again under the same key.
+
+        :param  key: The response cache key
+        :type   key: tuple
+        :param tags: The object models the removed response was tagged with
+        :type  tags: frozenset
+        """
+        with cls.LOCK:
+            entry = cls.CACHE.get(key, count=False)
+            for tag in tags.difference(entry[1] if entry else ()):
+                keys = cls.TAGS.get(tag)
+                if keys is None:
+                    continue
+                keys.discard(key)
+                if not keys:
+                    del cls.TAGS[tag]
+
+    @classmethod
+    def store(cls, key, response, tags, ttl, generation):
+        """
+        Store a response, unless the cache was invalidated while it was built.
+
+        :param        key: The response cache key
+        :type         key: tuple
+        :param   response: The manifest response
+        :type    response: mixed
+        :param       tags: The object models read while building the response
+        :type        tags: frozenset
+        :param        ttl: The number of seconds to cache the response
+        :type         ttl: int
+        :param generation: The invalidation generation when execution started
+        :type  generation: int
+        """
+        with cls.LOCK:
+            if not generation == cls.GENERATION[0]:
+                return
+
+            # Release the tags of a response being replaced
+            cls.CACHE.delete(key)
+
+            # Store the response with its tags
+            cls.CACHE.set(key, (deepcopy(response), frozenset(tags)), ttl=ttl)
+            for tag in tags:
+                cls.TAGS.setdefault(tag, set()).add(key)
+
+    @classmethod
+    def invalidate(cls, model=None):
+        """
+        Invalidate cached responses built from an object model, or all cached
+        responses if no model is specified.
+
+        :param model: The object model class name
+        :type  model: str
+        :rtype: int
+        """
+        with cls.LOCK:
+            cls.GENERATION[0] += 1
+
+            # Invalidate all responses
+            if model is None:
+                cls.TAGS.clear()
+                return cls.CACHE.purge()
+
+            # Invalidate tagged responses
+            keys = cls.TAGS.pop(model, set())
+            for key in keys:
+                cls.CACHE.delete(key)
+            return len(keys)
+
+    @classmethod
+    def stats(cls):
+        """
+        Return response cache statistics.
+
+        :rtype: dict
+        """
+        return cls.CACHE.stats()
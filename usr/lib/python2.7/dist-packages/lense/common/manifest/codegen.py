@@ -0,0 +1,373 @@
+import os
+import imp
+import hmac
+import marshal
+from hashlib import sha256
+from tempfile import mkstemp
+from stat import S_IWGRP, S_IWOTH
+from six import string_types, integer_types
+
+# Django Libraries
+from django.conf import settings
+
+# Generated code format version, bump when the generated source or file format changes
+VERSION = 2
+
+# Bytecode cache file header
+MAGIC   = '{0}LMC{1}'.format(imp.get_magic(), VERSION)
+
+class CodegenUnsupported(Exception):
+    """
+    The manifest contains a construct the code generator cannot reproduce
+    exactly, the interpreter is used instead.
+    """
+    pass
+
+class ManifestSource(object):
+    """
+    Generate Python source for a compiled manifest template. Reference keys are
+    mapped to local variables, Lense commons paths are bound once when they are
+    first used.
+    """
+    def __init__(self, template):
+        """
+        :param template: The compiled manifest template
+        :type  template: CompiledTemplate
+        """
+        self.template = template
+
+        # Known reference keys (request data is inserted at runtime)
+        self.keys     = ['__DATA__'] + [obj.key for obj in template.objects]
+
+        # Bound commons paths / generated lines
+        self.commons  = {}
+        self.lines    = []
+
+    def emit(self, line, indent=1):
+        """
+        Append a line of generated source.
+        """
+        self.lines.append('{0}{1}'.format('    ' * indent, line))
+
+    def bind(self, path):
+        """
+        Bind a commons path to a local variable on first use.
+
+        :param path: The commons path
+        :type  path: str
+        :rtype: str
+        """
+        if not path in self.commons:
+            self.commons[path] = 'c_{0}'.format(len(self.commons))
+            self.emit('{0} = MAP({1})'.format(self.commons[path], repr(path)))
+        return self.commons[path]
+
+    def reference(self, key):
+        """
+        Generate an expression for an internal reference.
+
+        :param key: The reference key, optionally with nested attributes
+        :type  key: str
+        :rtype: str
+        """
+        objkeys = key.split('.')
+
+        # Reference key must be defined
+        if not objkeys[0] in self.keys:
+            raise CodegenUnsupported('Undefined key reference: {0}'.format(key))
+
+        # Top level reference
+        if len(objkeys) == 1:
+            return 'v_{0}'.format(key)
+
+        # Object keys
+        return 'WALK(v_{0}, {1})'.format(objkeys[0], repr(objkeys[1:]))
+
+    def value(self, value):
+        """
+        Generate an expression for a nested argument value.
+
+        :param value: The argument value
+        :type  value: mixed
+        :rtype: str
+        """
+
+        # Boolean / number value
+        if isinstance(value, (bool, integer_types)) or value is None:
+            return repr(value)
+
+        # Nested keyword arguments
+        if isinstance(value, dict):
+            if 'call' in value:
+                raise CodegenUnsupported('Nested method mappings are not supported')
+            return '{{{0}}}'.format(', '.join(['{0}: {1}'.format(repr(k), self.value(v)) for k,v in value.iteritems()]))
+
+        # Nested arguments
+        if isinstance(value, list):
+            return '[{0}]'.format(', '.join([self.value(v) for v in value]))
+
+        # Unsupported value type
+        if not isinstance(value, string_types):
+            raise CodegenUnsupported('Unsupported value type: {0}'.format(type(value)))
+
+        # Internal reference
+        if value.startswith('#'):
+            return self.reference(value[1:])
+
+        # Commons reference
+        if value.startswith('LENSE'):
+            return self.bind(value)
+
+        # Static string
+        return repr(value)
+
+    def arguments(self, value, kwargs=False):
+        """
+        Generate an expression for top level method arguments.
+
+        :param  value: The args or kwargs mapping
+        :type   value: list|dict|str
+        :param kwargs: Mapping keyword arguments
+        :type  kwargs: bool
+        :rtype: str
+        """
+        if isinstance(value, (dict if kwargs else list)):
+            return self.value(value)
+
+        # Reference / commons arguments
+        if isinstance(value, string_types) and not value.startswith('**'):
+            if value.startswith('#'):
+                return self.reference(value[1:])
+            if value.startswith('*'):
+                return self.bind(value[1:])
+        raise CodegenUnsupported('Cannot parse arguments: {0}'.format(repr(value)))
+
+    def call(self, attrs):
+        """
+        Generate an expression for a method mapping.
+
+        :param attrs: The compiled object attributes
+        :type  attrs: dict
+        :rtype: str
+        """
+        path   = attrs['call']
+        args   = self.arguments(attrs.get('args', []))
+        kwargs = self.arguments(attrs.get('kwargs', {}), kwargs=True)
+
+        # Commons / internal reference method
+        if path.startswith('LENSE'):
+            method = self.bind(path)
+        elif path.startswith('#'):
+            method = self.reference(path[1:])
+        else:
+            raise CodegenUnsupported('Unsupported method mapping: {0}'.format(path))
+        return '{0}(*{1}, **{2})'.format(method, args, kwargs)
+
+    def compiled(self, obj):
+        """
+        Generate the statements for a single compiled object.
+
+        :param obj: The compiled object
+        :type  obj: _CompiledObject
+        """
+        local = 'v_{0}'.format(obj.key)
+
+        # Parameters are validated by the compiled object
+        if obj.type == 'params':
+            self.emit('o_params.execute()')
+            self.emit('v_params = o_params.value')
+            return
+
+        # Variable
+        if obj.type == 'var':
+
+            # Static value (allow empty lists and dictionaries)
+            if obj.attrs.get('static', False) != False:
+                self.emit('{0} = o_{1}.attrs[\'static\']'.format(local, obj.key))
+
+            # Reference another variable
+            if obj.attrs.get('ref', False):
+                self.emit('{0} = {1}'.format(local, self.reference(obj.attrs['ref'])))
+
+            # Commons mapping
+            if obj.attrs.get('fetch', False):
+                self.emit('{0} = {1}'.format(local, self.bind(obj.attrs['fetch'])))
+
+        # Method mapping
+        if (obj.type == 'var' and obj.attrs.get('call', False)) or obj.type == 'action':
+            self.emit('{0} = {1}'.format(local, self.call(obj.attrs)))
+
+            # Ensure a value (arguments are passed unmapped, as by the interpreter)
+            if obj.attrs.get('ensure', False):
+                self.emit('{0}({1}, **o_{2}.attrs[\'ensure\'])'.format(self.bind('LENSE.REQUEST.ensure'), local, obj.key))
+
+        # Response
+        if obj.type == 'response':
+            self.emit('{0} = {1}'.format(local, self.value(obj.attrs)))
+
+        # Store the value / execution state
+        self.emit('o_{0}.value = {1}'.format(obj.key, local))
+        self.emit('o_{0}.state = \'executed\''.format(obj.key))
+
+    def generate(self):
+        """
+        Generate the manifest function source.
+
+        :rtype: str
+        """
+        self.emit('def manifest(INDEX, MAP, WALK):', indent=0)
+
+        # Compiled objects / local values
+        for key in self.keys:
+            self.emit('o_{0} = INDEX[{1}]'.format(key, repr(key)))
+        self.emit('{0} = None'.format(' = '.join(['v_{0}'.format(key) for key in self.keys])))
+
+        # Request data
+        self.emit('v___DATA__ = o___DATA__.attrs[\'static\']')
+        self.emit('o___DATA__.value = v___DATA__')
+        self.emit('o___DATA__.state = \'executed\'')
+
+        # Compiled objects
+        for obj in self.template.objects:
+            self.compiled(obj)
+        return '\n'.join(self.lines) + '\n'
+
+class ManifestCodegen(object):
+    """
+    Ahead of time code generation for compiled manifests. Generated functions
+    are cached on disk as bytecode, keyed by the manifest content hash. Cache
+    files are signed with the Django secret key and only used from a directory
+    owned by the engine user that no other user can write to.
+    """
+    @staticmethod
+    def path(digest):
+        """
+        Return the bytecode cache path for a manifest.
+
+        :param digest: The manifest content hash
+        :type  digest: str
+        :rtype: str
+        """
+        return os.path.join(getattr(LENSE.CONF.engine, 'manifest_cache', '/var/cache/lense/manifests'), '{0}.lmc'.format(digest))
+
+    @staticmethod
+    def sign(digest, payload):
+        """
+        Sign a marshalled code object for a manifest.
+
+        :param  digest: The manifest content hash
+        :type   digest: str
+        :param payload: The marshalled code object
+        :type  payload: str
+        :rtype: str|None
+        """
+        key = getattr(settings, 'SECRET_KEY', None)
+        if not key:
+            return None
+        return hmac.new(str(key), '{0}:{1}'.format(digest, payload), sha256).hexdigest()
+
+    @staticmethod
+    def trusted(path):
+        """
+        Check that a cache file or directory is owned by the engine user and not
+        writable by other users.
+
+        :param path: The file or directory path
+        :type  path: str
+        :rtype: bool
+        """
+        stat = os.stat(path)
+        return stat.st_uid == os.getuid() and not (stat.st_mode & (S_IWGRP | S_IWOTH))
+
+    @classmethod
+    def read(cls, digest):
+        """
+        Read a cached code object from disk.
+
+        :param digest: The manifest content hash
+        :type  digest: str
+        :rtype: code|None
+        """
+        path = cls.path(digest)
+        try:
+            if not (cls.trusted(os.path.dirname(path)) and cls.trusted(path)):
+                LENSE.LOG.warning('<ManifestCodegen.read> Ignoring untrusted manifest cache file: {0}'.format(path))
+                return None
+            with open(path, 'rb') as f:
+                if not f.read(len(MAGIC)) == MAGIC:
+                    return None
+                signature = f.read(64)
+                payload   = f.read()
+
+            # Signature must match the payload
+            expected = cls.sign(digest, payload)
+            if not expected or not hmac.compare_digest(signature, expected):
+                LENSE.LOG.warning('<ManifestCodegen.read> Invalid signature for manifest cache file: {0}'.format(path))
+                return None
+            return marshal.loads(payload)
+
+        # Cache miss or corrupt cache file
+        except (IOError, OSError, EOFError, ValueError, TypeError):
+            return None
+
+    @classmethod
+    def write(cls, digest, code):
+        """
+        Atomically write a signed code object to the disk cache.
+
+        :param digest: The manifest content hash
+        :type  digest: str
+        :param   code: The compiled code object
+        :type    code: code
+        """
+        path      = cls.path(digest)
+        payload   = marshal.dumps(code)
+        signature = cls.sign(digest, payload)
+
+        # Cannot sign without a secret key
+        if not signature:
+            return
+        try:
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path), 0700)
+
+            # Do not write into a directory other users can modify
+            if not cls.trusted(os.path.dirname(path)):
+                LENSE.LOG.warning('<ManifestCodegen.write> Not caching manifest {0}, untrusted cache directory: {1}'.format(digest, os.path.dirname(path)))
+                return
+            fd, tmp = mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(MAGIC)
+                f.write(signature)
+                f.write(payload)
+            os.rename(tmp, path)
+
+        # Cache directory not writable
+        except (IOError, OSError) as e:
+            LENSE.LOG.debug('<ManifestCodegen.write> Failed to cache generated manifest {0}: {1}'.format(digest, str(e)))
+
+    @classmethod
+    def function(cls, template):
+        """
+        Load or generate the execution function for a compiled manifest template.
+
+        :param template: The compiled manifest template
+        :type  template: CompiledTemplate
+        :rtype: function|None
+        """
+        code = cls.read(template.digest)
+
+        # Generate and cache the code object
+        if code is None:
+            try:
+                source = ManifestSource(template).generate()
+            except CodegenUnsupported as e:
+                LENSE.LOG.debug('<ManifestCodegen.function> Interpreting manifest {0}: {1}'.format(template.digest, str(e)))
+                return None
+            code = compile(source, '<manifest:{0}>'.format(template.digest), 'exec')
+            cls.write(template.digest, code)
+
+        # Define the function
+        namespace = {}
+        exec code in namespace
+        return namespace['manifest']
@@ -1,3 +1,4 @@
+from copy import copy, deepcopy
 from six import string_types, integer_types
 from json import dumps as jsonDump
 
@@ -49,12 +50,31 @@ class _CompiledObject(object):
         Render the compiled object to a JSON parseable object.
         """
 
-        # Append type and key
-        self.attrs['type'] = self.type
-        self.attrs['key']  = self.key
+        # Append type and key (attributes may be shared with a cached template)
+        rendered = dict(self.attrs)
+        rendered['type'] = self.type
+        rendered['key']  = self.key
 
         # Return the rendered object
-        return self.attrs
+        return rendered
+
+    def instance(self):
+        """
+        Create a fresh, unexecuted copy of a compiled object. Attributes are
+        shared with the source object, static values are copied so they can be
+        safely modified during execution.
+        """
+        obj = copy(self)
+
+        # Reset the calculated value / execution state
+        obj.value = None
+        obj.state = 'compiled'
+
+        # Static values may be modified in place
+        if 'static' in self.attrs:
+            obj.attrs = dict(self.attrs)
+            obj.attrs['static'] = deepcopy(self.attrs['static'])
+        return obj
 
     def execute(self):
         """
@@ -150,70 +170,18 @@ class CompiledParameters(_CompiledObject):
         super(CompiledParameters, self).__init__('params', 'params', **params)
 
         # Request data container
-        self.data = None
-
-    def validate(self):
-        """
-        Validate compiled request parameters.
-        """
-
-        # Reject unsupported parameters
-        for k,v in self.data.value.iteritems():
-            if not k in self.value:
-                raise ManifestError('Supplied unsupported attribute: {0}'.format(k))
-
-        # Validate parameters against request data
-        for param, attrs in self.value.iteritems():
-
-            # Parameter not in request data
-            if not param in self.data.value:
-
-                # Parameter is required but no default provided
-                if attrs.get('required', False) and not 'default' in attrs:
-                    raise ManifestError('Missing required parameter "{0}" and no default defined.'.format(param))
-
-            # Parameter is present
-            else:
-
-                # Type validation
-                if 'type' in attrs and not LENSE.MANIFEST.VALIDATE.type(self.data.value[param], attrs['type']):
-                    raise ManifestError('Invalid data type for parameter "{0}", should be: {1}'.format(param, attrs['type']))
+        self.data      = None
 
-                # Library validation
-                if 'validate' in attrs:
+        # Compiled parameter validator
+        self.validator = LENSE.MANIFEST.VALIDATE.parameters(params)
 
-                    # Must be a supported validation method
-                    if not hasattr(LENSE.MANIFEST.VALIDATE, attrs['validate']):
-                        raise ManifestError('Undefined validation method: {0}'.format(attrs['validate']))
-
-                    # Run the validation method
-                    if not getattr(LENSE.MANIFEST.VALIDATE, attrs['validate'])(self.data.value[param]):
-                        raise ManifestError('Validation method "{0}" failed for parameter: {1}'.format(attrs['validate'], param))
-
-    def process(self):
+    def instance(self):
         """
-        Process compiled request parameters.
+        Create a fresh, unexecuted copy of compiled parameters.
         """
-        for param, attrs in self.value.iteritems():
-
-            # Assign any default values
-            if not (param in self.data.value) and ('default' in attrs):
-
-                # Commons mapping
-                if attrs['default'].startswith('LENSE'):
-                    mapped = LENSE.MANIFEST.mapCommon(attrs['default'])
-
-                    # Callable method
-                    if callable(mapped):
-                        self.data.set(param, mapped())
-
-                    # Variable
-                    else:
-                        self.data.set(param, mapped)
-
-                # Static value
-                else:
-                    self.data.set(param, attrs['default'])
+        obj = super(CompiledParameters, self).instance()
+        obj.data = None
+        return obj
 
     def execute(self):
         """
@@ -225,8 +193,57 @@ class CompiledParameters(_CompiledObject):
         self.data = LENSE.MANIFEST.COMPILED.get('__DATA__')
 
         # Validate and process request parameters
-        self.validate()
-        self.process()
+        self.validator(self.data)
+
+class CompiledTemplate(object):
+    """
+    Class object representing an immutable, reusable compiled manifest. Request
+    specific execution contexts are created from the template objects.
+    """
+    def __init__(self, handler, digest, objects, data=None, override=False, options=None, graph=None):
+        """
+        :param  handler: The handler UUID the manifest belongs to
+        :type   handler: str
+        :param   digest: The manifest content hash
+        :type    digest: str
+        :param  objects: The compiled template objects
+        :type   objects: list
+        :param     data: Request data overrides defined by the manifest
+        :type      data: dict
+        :param override: The manifest defines request data overrides
+        :type  override: bool
+        :param  options: Manifest execution options
+        :type   options: dict
+        :param    graph: The object dependency graph for concurrent execution
+        :type     graph: OrderedDict
+        """
+        self.handler  = handler
+        self.digest   = digest
+        self.objects  = tuple(objects)
+        self.override = override
+        self.options  = options or {}
+        self.graph    = graph
+        self._data    = data
+
+        # Generated execution function
+        self.function = None
+
+    def __repr__(self):
+        return '<{0}#{1}:{2}>'.format(self.__class__.__name__, self.handler, self.digest)
+
+    @property
+    def key(self):
+        """
+        The template cache key.
+        """
+        return (self.handler, self.digest)
+
+    @property
+    def data(self):
+        """
+        Return a copy of any request data overrides.
+        """
+        return deepcopy(self._data)
 
 class CompiledManifest(object):
     """
@@ -236,9 +253,65 @@ class CompiledManifest(object):
         self.objects  = []
         self.uuid     = LENSE.uuid4()
 
+        # Reference key index
+        self._index   = {}
+
+        # Execution options / dependency graph
+        self.options  = {}
+        self.graph    = None
+
+        # Generated execution function
+        self.function = None
+
     def __repr__(self):
         return '<{0}#{1}>'.format(self.__class__.__name__, self.uuid)
 
+    def template(self, handler, digest, data=None, override=False, options=None, graph=None):
+        """
+        Create a reusable template from the currently compiled objects.
+
+        :param  handler: The handler UUID the manifest belongs to
+        :type   handler: str
+        :param   digest: The manifest content hash
+        :type    digest: str
+        :param     data: Request data overrides defined by the manifest
+        :type      data: dict
+        :param override: The manifest defines request data overrides
+        :type  override: bool
+        :param  options: Manifest execution options
+        :type   options: dict
+        :param    graph: The object dependency graph for concurrent execution
+        :type     graph: OrderedDict
+        :rtype: CompiledTemplate
+        """
+        self.options = options or {}
+        self.graph   = graph
+        return CompiledTemplate(handler, digest, [x.instance() for x in self.objects],
+            data     = data,
+            override = override,
+            options  = options,
+            graph    = graph)
+
+    def load(self, template):
+        """
+        Load fresh copies of compiled objects from a cached template.
+
+        :param template: The compiled manifest template
+        :type  template: CompiledTemplate
+        """
+        for obj in template.objects:
+            self.append(obj.instance())
+
+        # Execution options / dependency graph
+        self.options = template.options
+        self.graph   = template.graph
+
+    def run(self):
+        """
+        Execute the compiled objects using the generated manifest function.
+        """
+        self.function(self._index, LENSE.MANIFEST.mapCommon, LENSE.OBJECTS.walkattr)
+
     def haskey(self, key):
         """
         Check if the compiled manifest has an object with a specified reference key.
@@ -247,10 +320,7 @@ class CompiledManifest(object):
         :type  key: str
         :rtype: bool
         """
-        for obj in self.objects:
-            if obj.key == key:
-                return True
-        return False
+        return key in self._index
 
     def getkey(self, key):
         """
@@ -260,9 +330,9 @@ class CompiledManifest(object):
         :type  key: str
         :rtype: CompiledObject
         """
-        for obj in self.objects:
-            if obj.key == key:
-                return obj
+        obj = self._index.get(key)
+        if obj is not None:
+            return obj
         raise ManifestError('Unable to locate reference key "{0}" in {1}'.format(key, repr(self)))
 
     def dump(self):
@@ -280,7 +350,7 @@ class CompiledManifest(object):
         """
 
         # Cannot duplicated reference keys
-        if self.haskey(obj.key):
+        if obj.key in self._index:
             raise ManifestError('Cannot have a duplicate reference key "{0}" in {1}'.format(obj.key, repr(self)))
 
         # Put at a specific position
@@ -291,6 +361,9 @@ class CompiledManifest(object):
         else:
             self.objects.append(obj)
 
+        # Index the reference key
+        self._index[obj.key] = obj
+
     def appendResponse(self, params):
         """
         Helper method for storing a compiled response.
@@ -352,7 +425,8 @@ class CompiledManifest(object):
                 'call': value['call'],
                 'kwargs': value.get('kwargs', {}),
                 'args': value.get('args', []),
-                'ensure': value.get('ensure', False)
+                'ensure': value.get('ensure', False),
+                'serial': value.get('serial', False)
             }), position=position)
 
         # Commons mapping
@@ -368,17 +442,11 @@ class CompiledManifest(object):
         :param key: The object reference key
         :type  key: str
         """
-        if not self.haskey(key):
+        if not key in self._index:
             raise ManifestError('Cannot delete object reference key "{0}" in {1}, no such key'.format(key, repr(self)))
 
-        # Delete the compiled object
-        index = None
-        for i,o in enumerate(self.objects):
-            if o['key'] == key:
-                index = i
-
         # Delete the object
-        del self.objects[index]
+        self.objects.remove(self._index.pop(key))
 
     def get(self, key, attr=None, default=None):
         """
@@ -393,15 +461,15 @@ class CompiledManifest(object):
         :rtype: mixed
         """
 
+        # Get the referenced object
+        refobj = self._index.get(key)
+
         # Make sure the compiled object has the reference key
-        if not self.haskey(key):
+        if refobj is None:
             if default:
                 return default
             raise ManifestError('Cannot find object reference key "{0}" in {1}'.format(key, repr(self)))
 
-        # Get the referenced object
-        refobj = self.getkey(key)
-
         # If extracting an attribute
         if attr:
             if not refobj.hasattr(attr):
@@ -420,5 +488,5 @@ class CompiledManifest(object):
         :param key: The key check duplicates for
         :type  key: str
         """
-        if self.haskey(key):
+        if key in self._index:
             raise ManifestError('Duplicate key #{0} detected, keys must be unique'.format(key))
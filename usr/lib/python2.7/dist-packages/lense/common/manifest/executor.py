@@ -0,0 +1,327 @@
+from sys import exc_info
+from atexit import register
+from Queue import Queue
+from itertools import count
+from threading import Thread, Lock, local
+from collections import OrderedDict, deque
+from six import string_types
+
+# Django Libraries
+from django.db import connection, close_old_connections
+
+# Lense Libraries
+from lense.common.exceptions import ManifestError
+from lense.common.objects.base import ObjectReads
+from lense.common.manifest.resolver import ManifestResolver
+
+# Compiled object types that act as execution barriers
+BARRIERS = ['params', 'response']
+
+def references(value, refs=None):
+    """
+    Recursively collect reference keys from a compiled object attribute.
+
+    :param value: The attribute value to walk
+    :type  value: mixed
+    :param  refs: Any previously collected references
+    :type   refs: set
+    :rtype: set
+    """
+    refs = set() if refs is None else refs
+
+    # Reference string
+    if isinstance(value, string_types):
+        if value.startswith('#'):
+            refs.add(value[1:].split('.')[0])
+
+    # Nested arguments
+    elif isinstance(value, list):
+        for v in value:
+            references(v, refs)
+
+    # Nested keyword arguments
+    elif isinstance(value, dict):
+        for v in value.itervalues():
+            references(v, refs)
+    return refs
+
+class ManifestWorkers(object):
+    """
+    Process wide pool of manifest worker threads shared by concurrent manifest
+    executions. Threads are reused between executions instead of being created
+    for every request, and check their database connection once per execution,
+    as Django does once per request.
+    """
+    TASKS   = Queue()
+    THREADS = []
+    LOCK    = Lock()
+
+    # Worker thread state: worker flag / last execution served
+    LOCAL   = local()
+
+    # Maximum number of worker threads
+    MAX     = 16
+
+    @classmethod
+    def start(cls, size):
+        """
+        Make sure the pool has at least a number of worker threads.
+
+        :param size: The number of worker threads required
+        :type  size: int
+        """
+        with cls.LOCK:
+            while len(cls.THREADS) < min(size, cls.MAX):
+                thread = Thread(target=cls._worker)
+                thread.daemon = True
+                thread.start()
+                cls.THREADS.append(thread)
+
+    @classmethod
+    def is_worker(cls):
+        """
+        Check if the current thread is a pool worker.
+
+        :rtype: bool
+        """
+        return getattr(cls.LOCAL, 'worker', False)
+
+    @classmethod
+    def submit(cls, executor, obj):
+        """
+        Queue a compiled object for execution by the pool.
+
+        :param executor: The manifest executor running the object
+        :type  executor: ManifestExecutor
+        :param      obj: The compiled object
+        :type       obj: _CompiledObject
+        """
+        cls.TASKS.put((executor, obj))
+
+    @classmethod
+    def stop(cls):
+        """
+        Stop the worker threads, i.e. before the interpreter exits.
+        """
+        with cls.LOCK:
+            for thread in cls.THREADS:
+                cls.TASKS.put(None)
+            for thread in cls.THREADS:
+                thread.join()
+            del cls.THREADS[:]
+
+    @classmethod
+    def _worker(cls):
+        """
+        Worker thread, runs queued compiled objects for any executor until it
+        receives a stop signal.
+        """
+        cls.LOCAL.worker = True
+        while True:
+            task = cls.TASKS.get()
+            if task is None:
+                return
+            task[0]._task(task[1])
+
+# Stop idle workers before interpreter shutdown
+register(ManifestWorkers.stop)
+
+class ManifestExecutor(object):
+    """
+    Execute compiled manifest objects concurrently, following a dependency graph
+    built from each object's references.
+    """
+
+    # Execution identifiers
+    COUNTER = count()
+
+    def __init__(self, compiled, execute, workers=4):
+        """
+        :param compiled: The compiled manifest
+        :type  compiled: CompiledManifest
+        :param  execute: The method used to execute a single compiled object
+        :type   execute: callable
+        :param  workers: The maximum number of worker threads
+        :type   workers: int
+        """
+        self.compiled = compiled
+        self.execute  = execute
+        self.workers  = max(1, min(workers, ManifestWorkers.MAX))
+
+        # Execution identifier / completion queue
+        self._id      = next(self.COUNTER)
+        self._done    = Queue()
+
+        # Request context / object models read by the calling thread
+        self._context = LENSE.CONTEXT.snapshot()
+        self._reads   = ObjectReads.current()
+
+    @staticmethod
+    def graph(objects):
+        """
+        Build the dependency graph for a list of compiled objects. Objects depend on
+        earlier objects they reference, and parameters, responses and objects declared
+        as serial act as barriers. Actions run in their defined order, and objects
+        making calls do not run across an action, so calls observe the same writes
+        as in sequential execution.
+
+        :param objects: The compiled objects in definition order
+        :type  objects: list
+        :rtype: OrderedDict
+        """
+        keys    = [obj.key for obj in objects]
+        index   = dict([(k, i) for i,k in enumerate(keys)])
+        graph   = OrderedDict([(k, set()) for k in keys])
+        barrier = None
+        action  = None
+        calls   = []
+
+        for i, obj in enumerate(objects):
+            deps = graph[obj.key]
+
+            # Barriers depend on everything before them
+            if obj.type in BARRIERS or obj.attrs.get('serial', False):
+                deps.update(keys[:i])
+                barrier = obj.key
+                continue
+
+            # Everything after a barrier depends on it
+            if barrier:
+                deps.add(barrier)
+
+            # Calls run after the preceding action
+            if action and 'call' in obj.attrs:
+                deps.add(action)
+
+            # Actions keep their relative order, and run after the preceding calls
+            if obj.type == 'action':
+                deps.update(calls)
+                action = obj.key
+                calls  = []
+            elif 'call' in obj.attrs:
+                calls.append(obj.key)
+
+            # Referenced objects
+            refs = references(obj.attrs.get('args', []))
+            refs = references(obj.attrs.get('kwargs', {}), refs)
+            for attr in ['ref', 'call']:
+                value = obj.attrs.get(attr)
+                if isinstance(value, string_types):
+                    refs.add((value if attr == 'ref' else value.lstrip('#')).split('.')[0])
+
+            for ref in refs:
+                if not ref in graph or ref == obj.key:
+                    continue
+
+                # Earlier objects must run first
+                if index[ref] < i:
+                    deps.add(ref)
+
+                # Later objects must not run until this object has read them
+                else:
+                    graph[ref].add(obj.key)
+
+        # Freeze the graph
+        return OrderedDict([(k, frozenset(v)) for k,v in graph.iteritems()])
+
+    def _task(self, obj):
+        """
+        Run a compiled object in a pool worker thread with the caller's request
+        context. The context is discarded afterwards, so idle workers do not keep
+        the request alive.
+
+        :param obj: The compiled object
+        :type  obj: _CompiledObject
+        """
+        LENSE.CONTEXT.restore(self._context)
+
+        # First object of this execution run by the worker, check the connection
+        if not getattr(ManifestWorkers.LOCAL, 'execution', None) == self._id:
+            ManifestWorkers.LOCAL.execution = self._id
+            close_old_connections()
+
+        # Paths resolved by this worker belong to the previous task's request
+        ManifestResolver.invalidate()
+        if self._reads is not None:
+            ObjectReads.start(self._reads)
+        try:
+            self.execute(obj)
+            self._done.put((obj.key, None))
+        except Exception:
+            self._done.put((obj.key, exc_info()))
+        finally:
+            ObjectReads.stop()
+            ManifestResolver.invalidate()
+            LENSE.CONTEXT.clear()
+
+    def run(self, graph):
+        """
+        Execute the compiled manifest objects. Inside a database transaction the
+        objects run sequentially in the calling thread, worker threads would use
+        their own connections outside of the transaction. Nested executions in a
+        pool worker also run sequentially, waiting on the pool from a worker could
+        leave no free worker to run the nested objects.
+
+        :param graph: The dependency graph
+        :type  graph: OrderedDict
+        """
+        objects = OrderedDict([(obj.key, obj) for obj in self.compiled.objects])
+
+        # Sequential execution in the caller's transaction or pool worker
+        if connection.in_atomic_block or ManifestWorkers.is_worker():
+            for obj in objects.itervalues():
+                self.execute(obj)
+            return
+
+        # Objects not in the graph (request data) run first
+        for key, obj in objects.items():
+            if not key in graph:
+                self.execute(obj)
+                del objects[key]
+
+        # Graph must match the compiled objects
+        if not set(objects.keys()) == set(graph.keys()):
+            raise ManifestError('Dependency graph does not match compiled objects in {0}'.format(repr(self.compiled)))
+
+        # Remaining dependencies / dependents
+        remaining  = dict([(k, set(v)) for k,v in graph.iteritems()])
+        dependents = dict([(k, []) for k in graph.iterkeys()])
+        for key, deps in graph.iteritems():
+            for dep in deps:
+                dependents[dep].append(key)
+
+        # Make sure the worker pool is running
+        ManifestWorkers.start(self.workers)
+
+        # Objects ready to run / running
+        ready    = deque([key for key, deps in graph.iteritems() if not deps])
+        pending  = 0
+        failures = {}
+
+        # Schedule objects as their dependencies complete, at most one per worker
+        while ready or pending:
+            while ready and pending < self.workers and not failures:
+                ManifestWorkers.submit(self, objects[ready.popleft()])
+                pending += 1
+            if not pending:
+                break
+
+            key, error = self._done.get()
+            pending -= 1
+
+            # Stop scheduling new objects on failure
+            if error:
+                failures[key] = error
+            if failures:
+                continue
+
+            # Queue dependents
+            for dependent in dependents[key]:
+                remaining[dependent].discard(key)
+                if not remaining[dependent]:
+                    ready.append(dependent)
+
+        # Raise the first failure in definition order
+        for key in objects.iterkeys():
+            if key in failures:
+                raise failures[key][0], failures[key][1], failures[key][2]
@@ -2,20 +2,22 @@ class ManifestInterface(object):
     """
     Interface class for compiling and executing manifest objects.
     """
-    def __init__(self, manifest):
+    def __init__(self, manifest, handler=None):
         """
         Initialize the manifest interface, and expose
         methods for compiling and executing the manifest.
 
         :param manifest: The manifest JSON object to compile/execute
         :type  manifest: dict|array
+        :param  handler: The UUID of the handler that owns the manifest, defaults to the mapped request handler
+        :type   handler: str
         :rtype: APIResponse
         """
 
         LENSE.LOG.info('@MANIFEST: compiling = {0}'.format(manifest))
 
         # Setup the manifest backend
-        LENSE.MANIFEST.setup(manifest)
+        LENSE.MANIFEST.setup(manifest, handler or LENSE.REQUEST.handler)
 
     def compile(self, dump=False):
         """
@@ -5,8 +5,20 @@ from inspect import isclass
 from six import string_types, integer_types
 
 # Lense Libraries
+from lense.common.utils import log_enabled, log_message
 from lense.common.exceptions import ManifestError
+from lense.common.http import HTTP_GET
 from lense.engine.api.handlers import RequestOK
+from lense.common.objects.base import ObjectReads
+from lense.common.manifest.executor import ManifestExecutor
+from lense.common.manifest.codegen import ManifestCodegen
+from lense.common.manifest.tracer import ManifestTracer
+
+# Manifest execution modes
+EXECUTE_SEQUENTIAL = 'sequential'
+EXECUTE_CONCURRENT = 'concurrent'
+EXECUTE_LAZY       = 'lazy'
+EXECUTE_MODES      = [EXECUTE_SEQUENTIAL, EXECUTE_CONCURRENT, EXECUTE_LAZY]
 
 class ManifestManager(object):
     """
@@ -17,22 +29,27 @@ class ManifestManager(object):
             LENSE.REQUEST.uuid, LENSE.REQUEST.path, LENSE.REQUEST.method
         ), method='__init__')
 
+        # Compiled object execution method for the current run
+        self._execute = self._executeObject
+
     def log(self, msg, level='info', method=None):
         """
         Wrapper method for logging with a prefix.
 
-        :param    msg: The message to log
-        :type     msg: str
+        :param    msg: The message to log, or a method returning the message
+        :type     msg: str|callable
         :param  level: The desired log level
         :type   level: str
         :param method: Optionally append the method to log prefix
         :type  method: str
         """
-        logger = getattr(LENSE.LOG, level, 'info')
+        if not log_enabled(level):
+            return
+        logger = getattr(LENSE.LOG, level, LENSE.LOG.info)
         logger('<{0}{1}> {2}'.format(
             self.__class__.__name__,
             '' if not method else '.{0}'.format(method),
-            msg
+            log_message(msg)
         ))
 
     def _compileResponse(self, response={}):
@@ -142,6 +159,35 @@ class ManifestManager(object):
         # Store parameter customization as a variable
         LENSE.MANIFEST.COMPILED.define_params(params)
 
+    def _compileOptions(self, options):
+        """
+        Compile manifest execution options.
+
+        :param options: The manifest options block
+        :type  options: dict
+        :rtype: dict
+        """
+
+        # Options must be a dictionary
+        if not isinstance(options, dict):
+            raise ManifestError('Manifest options must be a dictionary, not type({0})'.format(type(options)))
+
+        # Execution mode
+        if not options.get('execute', EXECUTE_SEQUENTIAL) in EXECUTE_MODES:
+            raise ManifestError('Invalid execution mode "{0}", must be one of: {1}'.format(options['execute'], ', '.join(EXECUTE_MODES)))
+
+        # Worker threads
+        if 'workers' in options and not (isinstance(options['workers'], integer_types) and options['workers'] > 0):
+            raise ManifestError('Option "workers" must be a positive integer')
+
+        # Response cache lifetime
+        if 'cache' in options and not (isinstance(options['cache'], integer_types) and options['cache'] > 0):
+            raise ManifestError('Option "cache" must be a positive number of seconds')
+
+        # Compiling options
+        self.log('Compiling options: {0}'.format(options), level='info', method='_compileOptions')
+        return options
+
     def _compileData(self, data):
         """
         Compile request data overrides if present.
@@ -189,7 +235,7 @@ class ManifestManager(object):
 
             # Object does not support dump method
             except Exception as e:
-                self.log('Failed to dump object: {0}: {1}'.format(repr(obj), str(e)), level='debug', method='_toJSON')
+                self.log(lambda: 'Failed to dump object: {0}: {1}'.format(repr(obj), str(e)), level='debug', method='_toJSON')
 
         # Log the processed response object
         self.log('Processing response object: type={0}, data_bytes={1}'.format(type(obj), getsizeof(obj)), method='_toJSON')
@@ -197,21 +243,18 @@ class ManifestManager(object):
         # Return the response object
         return obj
 
-    def compile(self, dump):
+    def _compileTemplate(self, digest):
         """
-        Compile the JSON manifest.
+        Compile the manifest definitions into a reusable template.
 
-        :param dump: Dump the representations of compiled objects
-        :type  dump: bool
-        :rtype: dict
+        :param digest: The manifest content hash
+        :type  digest: str
+        :rtype: CompiledTemplate
         """
-
-        # Must be a list of definitions
-        if not isinstance(LENSE.MANIFEST.json, list):
-            raise ManifestError('Parent block must be a list, found type({0}) instead'.format(type(LENSE.MANIFEST.json)))
-
-        # Default request data
-        request_data = LENSE.REQUEST.data
+        request_data = None
+        override     = False
+        options      = {}
+        graph        = None
 
         # Compiled each definition
         for i,d in enumerate(LENSE.MANIFEST.json):
@@ -227,6 +270,11 @@ class ManifestManager(object):
                 if k == '__DATA__':
                     self.log('Overridding request data: {0}'.format(v), level='info', method='compile')
                     request_data = v
+                    override     = True
+
+                # Execution options
+                elif k == 'options':
+                    options = self._compileOptions(v)
 
                 # Parameter customization
                 elif k == 'params':
@@ -248,26 +296,178 @@ class ManifestManager(object):
                 else:
                     raise ManifestError('Invalid definition key: {0}'.format(k))
 
+        # Build the dependency graph for concurrent execution
+        if options.get('execute') == EXECUTE_CONCURRENT:
+            graph = ManifestExecutor.graph(LENSE.MANIFEST.COMPILED.objects)
+
+        # Create the template from the compiled objects
+        return LENSE.MANIFEST.COMPILED.template(LENSE.MANIFEST.handler, digest,
+            data     = request_data,
+            override = override,
+            options  = options,
+            graph    = graph)
+
+    def compile(self, dump):
+        """
+        Compile the JSON manifest.
+
+        :param dump: Dump the representations of compiled objects
+        :type  dump: bool
+        :rtype: dict
+        """
+
+        # Must be a list of definitions
+        if not isinstance(LENSE.MANIFEST.json, list):
+            raise ManifestError('Parent block must be a list, found type({0}) instead'.format(type(LENSE.MANIFEST.json)))
+
+        # Look for a previously compiled template
+        digest   = LENSE.MANIFEST.digest = LENSE.MANIFEST.CACHE.digest(LENSE.MANIFEST.json)
+        template = LENSE.MANIFEST.CACHE.get(LENSE.MANIFEST.handler, digest)
+
+        # Load objects from the cached template
+        if template:
+            self.log(lambda: 'Loaded compiled manifest from cache: handler={0}, digest={1}'.format(LENSE.MANIFEST.handler, digest), level='debug', method='compile')
+            LENSE.MANIFEST.COMPILED.load(template)
+
+        # Compile and cache a new template
+        else:
+            self.log(lambda: 'Compiling manifest: handler={0}, digest={1}'.format(LENSE.MANIFEST.handler, digest), level='debug', method='compile')
+            template = self._compileTemplate(digest)
+
+            # Generate the execution function
+            if getattr(LENSE.CONF.engine, 'manifest_codegen', True) and template.options.get('execute', EXECUTE_SEQUENTIAL) == EXECUTE_SEQUENTIAL:
+                template.function = ManifestCodegen.function(template)
+
+            # Cache the template
+            LENSE.MANIFEST.CACHE.store(template)
+
+        # Generated execution function
+        LENSE.MANIFEST.COMPILED.function = template.function
+
         # Store request data
-        self._compileData(request_data)
+        self._compileData(template.data if template.override else LENSE.REQUEST.data)
 
         # Return the compiled manifest
         return LENSE.MANIFEST.COMPILED.dump() if dump else LENSE.MANIFEST.COMPILED.objects
 
-    def execute(self):
+    def _executeObject(self, obj):
         """
-        Execute the compiled manifest.
+        Execute a single compiled object.
+
+        :param obj: The compiled object to execute
+        :type  obj: _CompiledObject
         """
+        obj.execute()
 
-        # Compile the manifest
-        self.compile(False)
+        # Rendering large values is expensive, only when debugging
+        self.log(lambda: 'Executed compiled object {0}, value={1}, type={2}'.format(repr(obj), repr(obj.value), type(obj.value)), level='debug', method='execute')
+
+    def force(self, obj):
+        """
+        Evaluate a deferred variable on first reference.
+
+        :param obj: The compiled variable
+        :type  obj: CompiledVariable
+        """
+        obj.state = 'evaluating'
+        try:
+            self._execute(obj)
 
-        # Execute the compiled object
-        for obj in LENSE.MANIFEST.COMPILED.objects:
-            obj.execute()
-            self.log('Executed compiled object {0}, value={1}, type={2}'.format(repr(obj), repr(obj.value), type(obj.value)), level='debug', method='execute')
+        # Allow the variable to be retried
+        except:
+            obj.state = 'compiled'
+            raise
+
+    def _run(self):
+        """
+        Execute the compiled objects and generate the response.
+        """
+
+        # Per-object tracing
+        tracer  = ManifestTracer(LENSE.MANIFEST.handler) if ManifestTracer.enabled() else None
+        execute = self._executeObject if not tracer else tracer.wrap(self._executeObject)
+        LENSE.MANIFEST.TRACE = tracer
+        self._execute        = execute
+
+        try:
+
+            # Execute independent objects concurrently
+            if LENSE.MANIFEST.COMPILED.options.get('execute') == EXECUTE_CONCURRENT:
+                workers = LENSE.MANIFEST.COMPILED.options.get('workers', getattr(LENSE.CONF.engine, 'manifest_workers', 4))
+                self.log('Executing manifest concurrently: workers={0}'.format(workers), method='execute')
+                ManifestExecutor(LENSE.MANIFEST.COMPILED, execute, workers).run(LENSE.MANIFEST.COMPILED.graph)
+
+            # Defer variables until they are referenced
+            elif LENSE.MANIFEST.COMPILED.options.get('execute') == EXECUTE_LAZY:
+                for obj in LENSE.MANIFEST.COMPILED.objects:
+                    if obj.type == 'var' and not obj.key == '__DATA__':
+                        continue
+                    if obj.state == 'compiled':
+                        execute(obj)
+
+            # Execute the generated manifest function (not traceable per object)
+            elif LENSE.MANIFEST.COMPILED.function and not tracer:
+                self.log('Executing generated manifest function', level='debug', method='execute')
+                LENSE.MANIFEST.COMPILED.run()
+
+            # Execute the compiled objects in order
+            else:
+                for obj in LENSE.MANIFEST.COMPILED.objects:
+                    execute(obj)
+
+        # Store the completed trace
+        finally:
+            if LENSE.MANIFEST.COMPILED.options.get('execute') == EXECUTE_LAZY:
+                self._unevaluated(tracer)
+            if tracer:
+                tracer.finish()
 
         # If a response is defined
         if LENSE.MANIFEST.COMPILED.haskey('response'):
             self.log('Generating response...', method='execute')
             return self._toJSON(LENSE.MANIFEST.COMPILED.get('response').value)
+
+    def _unevaluated(self, tracer=None):
+        """
+        Report variables never evaluated in lazy mode in the log and trace.
+
+        :param tracer: The request tracer, if tracing
+        :type  tracer: ManifestTracer
+        """
+        unevaluated = [obj.key for obj in LENSE.MANIFEST.COMPILED.objects if obj.state == 'compiled']
+        self.log(lambda: 'Unevaluated variables: {0}'.format(unevaluated), level='debug', method='execute')
+        if tracer:
+            tracer.unevaluated = unevaluated
+
+    def execute(self):
+        """
+        Execute the compiled manifest.
+        """
+
+        # Compile the manifest
+        self.compile(False)
+
+        # Response caching is opt-in, only for idempotent requests to a known handler
+        ttl = LENSE.MANIFEST.COMPILED.options.get('cache')
+        if not ttl or not LENSE.REQUEST.method == HTTP_GET or LENSE.MANIFEST.handler is None:
+            return self._run()
+
+        # Look for a cached response
+        key      = LENSE.MANIFEST.RESPONSES.key(LENSE.MANIFEST.handler, LENSE.MANIFEST.digest, LENSE.MANIFEST.COMPILED.get('__DATA__', 'static'))
+        response = LENSE.MANIFEST.RESPONSES.get(key)
+        if response is not None:
+            self.log(lambda: 'Returning cached response: handler={0}'.format(LENSE.MANIFEST.handler), level='debug', method='execute')
+            return response
+
+        # Track the object models read while building the response
+        generation = LENSE.MANIFEST.RESPONSES.generation()
+        ObjectReads.start()
+        try:
+            response = self._run()
+        finally:
+            models = ObjectReads.stop()
+
+        # Cache the response
+        if response is not None:
+            LENSE.MANIFEST.RESPONSES.store(key, response, models, ttl, generation)
+        return response
@@ -0,0 +1,152 @@
+from threading import local
+
+# Lense Libraries
+from lense.common.exceptions import ManifestError
+
+# Commons attributes swapped or reloaded for each request
+VOLATILE = ['REQUEST', 'MANIFEST', 'AUTH', 'SOCKET', 'PORTAL', 'CLIENT', 'API', 'NAMESPACE']
+
+class ManifestResolver(object):
+    """
+    Process wide cache of resolved Lense commons paths. Paths under stable
+    commons attributes are bound to their target once. Paths under per-request
+    attributes cache the parent object until invalidated, and look up the final
+    attribute on each call so bound methods and values always belong to the
+    current request. Parent objects are cached per thread, since each thread
+    handles its own request.
+    """
+
+    # Resolved targets / per-thread parent objects
+    STABLE     = {}
+    LOCAL      = local()
+
+    # Resolution counters
+    COUNTERS   = {
+        'hits': 0,
+        'misses': 0,
+        'invalidations': 0,
+        'rebinds': 0
+    }
+
+    @classmethod
+    def parents(cls):
+        """
+        Return the parent objects resolved by the current thread.
+
+        :rtype: dict
+        """
+        try:
+            return cls.LOCAL.parents
+        except AttributeError:
+            cls.LOCAL.parents = {}
+            return cls.LOCAL.parents
+
+    @staticmethod
+    def walk(path, paths):
+        """
+        Walk a split commons path starting from the root namespace.
+
+        :param  path: The full commons path used for error messages
+        :type   path: str
+        :param paths: The path segments to walk
+        :type  paths: list
+        :rtype: mixed
+        """
+        mapped = LENSE
+        for p in paths:
+
+            # Root namespace
+            if p == 'LENSE':
+                continue
+
+            # Make sure mapping key exists
+            if not hasattr(mapped, p):
+                raise ManifestError('Invalid mapping path: {0}'.format(path))
+
+            # Store the next mapping
+            mapped = getattr(mapped, p)
+        return mapped
+
+    @classmethod
+    def resolve(cls, path):
+        """
+        Resolve a commons path to its target.
+
+        :param path: The commons path, i.e. LENSE.OBJECTS.USER.get
+        :type  path: str
+        :rtype: mixed
+        """
+
+        # Stable target
+        if path in cls.STABLE:
+            cls.COUNTERS['hits'] += 1
+            return cls.STABLE[path]
+
+        # Per-request parent object
+        parents = cls.parents()
+        if path in parents:
+            parent, attr = parents[path]
+            if hasattr(parent, attr):
+                cls.COUNTERS['hits'] += 1
+                return getattr(parent, attr)
+            raise ManifestError('Invalid mapping path: {0}'.format(path))
+
+        # Resolve the path
+        cls.COUNTERS['misses'] += 1
+        paths  = [p for p in path.split('.') if not p == 'LENSE']
+
+        # Per-request root attribute
+        if paths and paths[0] in VOLATILE:
+            parent = cls.walk(path, paths[:-1])
+            mapped = cls.walk(path, paths)
+            parents[path] = (parent, paths[-1])
+            return mapped
+
+        # Bind the target
+        cls.STABLE[path] = cls.walk(path, paths)
+        return cls.STABLE[path]
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Invalidate paths resolved through per-request commons attributes by the
+        current thread.
+        """
+        parents = cls.parents()
+        if parents:
+            parents.clear()
+            cls.COUNTERS['invalidations'] += 1
+
+    @classmethod
+    def rebind(cls, attr=None):
+        """
+        Discard bound targets for stable commons attributes. Called when a stable
+        attribute is replaced at runtime, or the commons object itself is replaced.
+
+        :param attr: The rebound commons attribute, i.e. OBJECTS, or all if None
+        :type  attr: str
+        """
+        if attr is None:
+            paths = list(cls.STABLE)
+        else:
+            paths = [p for p in cls.STABLE if p.split('.')[int(p.startswith('LENSE.'))] == attr]
+
+        # Drop the bound targets
+        for path in paths:
+            cls.STABLE.pop(path, None)
+        if paths:
+            cls.COUNTERS['rebinds'] += 1
+
+    @classmethod
+    def stats(cls):
+        """
+        Return path resolution statistics.
+
+        :rtype: dict
+        """
+        stats = dict(cls.COUNTERS)
+        stats.update({
+            'stable': len(cls.STABLE),
+            'volatile': len(cls.parents())
+        })
+        return stats
@@ -0,0 +1,136 @@
+from sys import getsizeof
+from threading import Lock
+from collections import deque, OrderedDict
+from timeit import default_timer as timer
+
+class ManifestTracer(object):
+    """
+    Opt-in tracer recording wall time, call count and result size for each
+    compiled manifest object. Completed traces are kept in a process wide
+    ring buffer.
+    """
+
+    # Completed traces
+    TRACES = deque(maxlen=100)
+    LOCK   = Lock()
+
+    def __init__(self, handler):
+        """
+        :param handler: The UUID of the handler that owns the manifest
+        :type  handler: str
+        """
+        self.handler = handler
+        self.request = LENSE.REQUEST.uuid
+        self.path    = LENSE.REQUEST.path
+        self.method  = LENSE.REQUEST.method
+
+        # Object records, shared by concurrent workers / total execution time
+        self.objects = OrderedDict()
+        self._lock   = Lock()
+        self.total   = 0.0
+        self.usage   = None
+
+        # Variables never evaluated in lazy mode
+        self.unevaluated = None
+        self._start  = timer()
+
+    def __repr__(self):
+        return '<{0}#{1}>'.format(self.__class__.__name__, self.request)
+
+    @staticmethod
+    def enabled():
+        """
+        Check if tracing is enabled for the current request, either by the
+        trace request header or the engine.manifest_trace config flag.
+
+        :rtype: bool
+        """
+        return getattr(LENSE.REQUEST, 'trace', False) or getattr(LENSE.CONF.engine, 'manifest_trace', False)
+
+    def wrap(self, execute):
+        """
+        Wrap a compiled object execution method with timing.
+
+        :param execute: The method used to execute a single compiled object
+        :type  execute: callable
+        :rtype: function
+        """
+        def traced(obj):
+            start = timer()
+            try:
+                execute(obj)
+            finally:
+                self.record(obj, timer() - start)
+        return traced
+
+    def record(self, obj, elapsed):
+        """
+        Record the execution of a compiled object.
+
+        :param     obj: The compiled object
+        :type      obj: _CompiledObject
+        :param elapsed: The execution time in seconds
+        :type  elapsed: float
+        """
+        size = getsizeof(obj.value)
+        with self._lock:
+            record = self.objects.get(obj.key)
+            if record is None:
+                record = self.objects.setdefault(obj.key, {
+                    'key': obj.key,
+                    'type': obj.type,
+                    'calls': 0,
+                    'wall_ms': 0.0,
+                    'size': 0
+                })
+            record['calls']   += 1
+            record['wall_ms'] += elapsed * 1000
+            record['size']     = size
+
+    def finish(self):
+        """
+        Complete the trace and store it in the ring buffer.
+
+        :rtype: dict
+        """
+        self.total = timer() - self._start
+        self.usage = LENSE.REQUEST.usage()
+        with self._lock:
+            trace = self.render()
+        with self.LOCK:
+            if not self.TRACES.maxlen == getattr(LENSE.CONF.engine, 'manifest_trace_buffer', self.TRACES.maxlen):
+                ManifestTracer.TRACES = deque(self.TRACES, maxlen=LENSE.CONF.engine.manifest_trace_buffer)
+            self.TRACES.append(trace)
+        return trace
+
+    def render(self):
+        """
+        Render the trace to a JSON friendly object.
+
+        :rtype: dict
+        """
+        return {
+            'request': self.request,
+            'handler': self.handler,
+            'path': self.path,
+            'method': self.method,
+            'total_ms': round(self.total * 1000, 3),
+            'attributes': self.usage,
+            'unevaluated': self.unevaluated,
+            'objects': [dict(r, wall_ms=round(r['wall_ms'], 3)) for r in self.objects.values()]
+        }
+
+    @classmethod
+    def traces(cls, handler=None, limit=None):
+        """
+        Query completed traces, most recent first.
+
+        :param handler: Only return traces for a handler UUID
+        :type  handler: str
+        :param   limit: The maximum number of traces to return
+        :type    limit: int
+        :rtype: list
+        """
+        with cls.LOCK:
+            traces = [t for t in reversed(cls.TRACES) if handler is None or t['handler'] == handler]
+        return traces[:limit] if limit else traces
@@ -1,5 +1,7 @@
 from uuid import UUID
 from re import compile
+from time import time
+from threading import Lock
 from six import string_types, integer_types
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
@@ -17,11 +19,20 @@ TYPES = {
     'dict': dict
 }
 
+# Validation regular expressions
+PATH_REGEX = compile(r'^[^\/][a-zA-Z0-9\/]*[^\/]$')
+NAME_REGEX = compile(r'^[a-zA-Z][a-zA-Z0-9_]*[a-zA-Z0-9]$')
+
 class ManifestValidate(object):
     """
     Class object for containing methods for validating manifest attribute
     values.
     """
+
+    # Parameter validation timing per handler
+    STATS = {}
+    LOCK  = Lock()
+
     @staticmethod
     def uuid(value):
         """
@@ -49,14 +60,14 @@ class ManifestValidate(object):
         """
         Validate a request path.
         """
-        return re.compile(r'^[^\/][a-zA-Z0-9\/]*[^\/]$').match(value)
+        return PATH_REGEX.match(value)
 
     @staticmethod
     def name(value):
         """
         Validate a name string.
         """
-        return re.compile(r'^[a-zA-Z][a-zA-Z0-9_]*[a-zA-Z0-9]$').match(value)
+        return NAME_REGEX.match(value)
 
     @staticmethod
     def method(value):
@@ -77,3 +88,130 @@ class ManifestValidate(object):
         if not isinstance(value, TYPES[mapping]):
             return False
         return True
+
+    @classmethod
+    def record(cls, handler, elapsed):
+        """
+        Record parameter validation time for a handler.
+
+        :param handler: The handler UUID
+        :type  handler: str
+        :param elapsed: The validation time in seconds
+        :type  elapsed: float
+        """
+        with cls.LOCK:
+            stats = cls.STATS.setdefault(handler, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            stats['count']   += 1
+            stats['total_ms'] += elapsed * 1000
+            stats['max_ms']   = max(stats['max_ms'], elapsed * 1000)
+
+    @classmethod
+    def stats(cls):
+        """
+        Return parameter validation timing per handler.
+
+        :rtype: dict
+        """
+        with cls.LOCK:
+            return dict([(h, dict(s, avg_ms=s['total_ms'] / s['count'])) for h,s in cls.STATS.iteritems()])
+
+    @classmethod
+    def parameters(cls, params):
+        """
+        Compile a parameters block into a single validator. The validator checks
+        request data for unsupported attributes, required parameters, types and
+        validation methods, then assigns any default values.
+
+        :param params: The parameters block
+        :type  params: dict
+        :rtype: function
+        """
+        allowed  = frozenset(params.iterkeys())
+        checks   = []
+        defaults = []
+
+        for param, attrs in params.iteritems():
+            mapping = attrs.get('type')
+            method  = attrs.get('validate')
+
+            # Required without a default / type check / validation method
+            checks.append((param,
+                attrs.get('required', False) and not 'default' in attrs,
+                mapping,
+                TYPES.get(mapping),
+                method,
+                getattr(cls, method, None) if method else None
+            ))
+
+            # Default values (commons mappings are resolved per request)
+            if 'default' in attrs:
+                default = attrs['default']
+                defaults.append((param, default, isinstance(default, string_types) and default.startswith('LENSE')))
+
+        def check(data):
+            """
+            Validate and process request data.
+
+            :param data: The compiled request data object
+            :type  data: CompiledVariable
+            """
+            values = data.value
+
+            # Reject unsupported parameters
+            for k in values:
+                if not k in allowed:
+                    raise ManifestError('Supplied unsupported attribute: {0}'.format(k))
+
+            # Validate parameters against request data
+            for param, required, mapping, types, method, validate in checks:
+
+                # Parameter not in request data
+                if not param in values:
+
+                    # Parameter is required but no default provided
+                    if required:
+                        raise ManifestError('Missing required parameter "{0}" and no default defined.'.format(param))
+                    continue
+                value = values[param]
+
+                # Type validation
+                if mapping:
+                    if types is None:
+                        raise ManifestError('Invalid type mapping: {0}'.format(mapping))
+                    if not isinstance(value, types):
+                        raise ManifestError('Invalid data type for parameter "{0}", should be: {1}'.format(param, mapping))
+
+                # Library validation
+                if method:
+
+                    # Must be a supported validation method
+                    if validate is None:
+                        raise ManifestError('Undefined validation method: {0}'.format(method))
+
+                    # Run the validation method
+                    if not validate(value):
+                        raise ManifestError('Validation method "{0}" failed for parameter: {1}'.format(method, param))
+
+            # Assign any default values
+            for param, default, commons in defaults:
+                if not param in values:
+
+                    # Commons mapping
+                    if commons:
+                        mapped = LENSE.MANIFEST.mapCommon(default)
+                        data.set(param, mapped() if callable(mapped) else mapped)
+
+                    # Static value
+                    else:
+                        data.set(param, default)
+
+        def validator(data):
+            """
+            Run the compiled validator and record the validation time.
+            """
+            start = time()
+            try:
+                check(data)
+            finally:
+                cls.record(LENSE.MANIFEST.handler, time() - start)
+        return validator
@@ -1,5 +1,6 @@
 from copy import copy
 from uuid import UUID
+from threading import local
 
 # Django Libraries
 from django.core.exceptions import ValidationError
@@ -8,7 +9,60 @@ from django.core.validators import validate_email
 # Lense Libraries
 from lense import import_class
 from lense.common.vars import GROUPS
+from lense.common.utils import log_enabled, log_message
 from lense.common.exceptions import RequestError
+from lense.common.manifest.cache import ManifestResponseCache
+
+class ObjectReads(object):
+    """
+    Track the object models read by the current thread, used to tag cached
+    manifest responses.
+    """
+    LOCAL = local()
+
+    @classmethod
+    def start(cls, models=None):
+        """
+        Start tracking reads, optionally sharing an existing set of models.
+
+        :param models: A set of models tracked by another thread
+        :type  models: set
+        :rtype: set
+        """
+        cls.LOCAL.models = set() if models is None else models
+        return cls.LOCAL.models
+
+    @classmethod
+    def current(cls):
+        """
+        Return the models tracked by the current thread, or None if not tracking.
+
+        :rtype: set|None
+        """
+        return getattr(cls.LOCAL, 'models', None)
+
+    @classmethod
+    def add(cls, model):
+        """
+        Record a model read if tracking.
+
+        :param model: The object model class name
+        :type  model: str
+        """
+        models = getattr(cls.LOCAL, 'models', None)
+        if models is not None:
+            models.add(model)
+
+    @classmethod
+    def stop(cls):
+        """
+        Stop tracking reads and return the models read.
+
+        :rtype: frozenset
+        """
+        models = getattr(cls.LOCAL, 'models', None)
+        cls.LOCAL.models = None
+        return frozenset(models or [])
 
 class LenseBaseObject(object):
     """
@@ -41,8 +95,35 @@ class LenseBaseObject(object):
         """
         Find out how many objects would be returned by a query.
         """
+        ObjectReads.add(self.cls)
         return self.model.objects.filter(**kwargs).count()
 
+    def _exists(self, **kwargs):
+        """
+        Check if a query would return any objects.
+        """
+        ObjectReads.add(self.cls)
+        return self.model.objects.filter(**kwargs).exists()
+
+    def select(self, *related, **kwargs):
+        """
+        Return a query set of filtered objects, optionally selecting related
+        objects in the same query.
+
+        :param related: Foreign key fields to select with each object
+        :type  related: list
+        :rtype: QuerySet
+        """
+        ObjectReads.add(self.cls)
+        objects = self.model.objects.filter(**kwargs)
+        return objects if not related else objects.select_related(*related)
+
+    def _invalidate(self):
+        """
+        Invalidate cached responses built from this object model.
+        """
+        ManifestResponseCache.invalidate(self.cls)
+
     def _process_read(self, objects):
         """
         Process read requests for objects.
@@ -52,19 +133,8 @@ class LenseBaseObject(object):
         :rtype: None|object|list
         """
 
-        # Objects references
-        objects_ref = []
-
-        # Multiple objects
-        if isinstance(objects, list):
-            for obj in objects:
-                if LENSE.PERMISSIONS.can_read(obj):
-                    objects_ref.append(obj)
-
-        # Single object
-        else:
-            if LENSE.PERMISSIONS.can_read(objects):
-                objects_ref.append(objects)
+        # Objects with read access, checked in a single permissions query
+        objects_ref = LENSE.PERMISSIONS.filter(LENSE.OBJECTS.as_list(objects), 'read')
 
         # Return an objects
         return None if not objects_ref else (objects_ref if (len(objects_ref) > 1) else objects_ref[0])
@@ -74,47 +144,37 @@ class LenseBaseObject(object):
 
         """
 
-        # Multiple objects
-        if isinstance(objects, list):
-            for obj in objects:
-                if LENSE.PERMISSIONS.can_delete(obj):
+        # Objects with delete access, checked in a single permissions query
+        for obj in LENSE.PERMISSIONS.filter(LENSE.OBJECTS.as_list(objects), 'delete'):
 
-                    # Flush permissions
-                    LENSE.OBJECTS.PERMISSIONS.flush(obj)
+            # Flush permissions
+            LENSE.OBJECTS.PERMISSIONS.flush(obj)
 
-                    # Delete the object
-                    obj.delete()
-                    self.log('Deleted object -> {0}'.format(repr(obj)), level='debug', method='_process_delete')
-
-        # Single object
-        else:
-            if LENSE.PERMISSIONS.can_delete(objects):
-
-                # Flush permissions
-                LENSE.OBJECTS.PERMISSIONS.flush(objects)
-
-                # Delete the object
-                objects.delete()
-                self.log('Deleted object -> {0}'.format(repr(objects)), level='debug', method='_process_delete')
+            # Delete the object
+            obj.delete()
+            self._invalidate()
+            self.log(lambda: 'Deleted object -> {0}'.format(repr(obj)), level='debug', method='_process_delete')
 
     def log(self, msg, level='info', method=None):
         """
         Wrapper method for logging with a prefix.
 
-        :param    msg: The message to log
-        :type     msg: str
+        :param    msg: The message to log, or a method returning the message
+        :type     msg: str|callable
         :param  level: The desired log level
         :type   level: str
         :param method: Optionally append the method to log prefix
         :type  method: str
         """
-        logger = getattr(LENSE.LOG, level, 'info')
+        if not log_enabled(level):
+            return
+        logger = getattr(LENSE.LOG, level, LENSE.LOG.info)
         logger('<{0}{1}:{2}@{3}> {4}'.format(
             self.logpre,
             '' if not method else '.{0}'.format(method),
             LENSE.REQUEST.USER.name,
             LENSE.REQUEST.client,
-            msg
+            log_message(msg)
         ))
 
     def is_email(self, emailstr):
@@ -149,9 +209,9 @@ class LenseBaseObject(object):
         """
         Check if an object exists.
         """
-        count = self._count(**kwargs)
-        self.log('Found {0} object(s) -> filter={1}'.format(str(count), str(kwargs)), level='debug', method='exists')
-        return count
+        found = self._exists(**kwargs)
+        self.log(lambda: 'Object(s) found={0} -> filter={1}'.format(str(found), str(kwargs)), level='debug', method='exists')
+        return found
 
     def update(self, obj, **kwargs):
         """
@@ -163,7 +223,8 @@ class LenseBaseObject(object):
             for k,v in kwargs.iteritems():
                 setattr(obj, k, v)
             obj.save()
-            self.log('Updated object -> {0}'.format(repr(obj)), level='debug', method='update')
+            self._invalidate()
+            self.log(lambda: 'Updated object -> {0}'.format(repr(obj)), level='debug', method='update')
             return True
 
         # Failed to update object
@@ -186,7 +247,8 @@ class LenseBaseObject(object):
             # Create/save the object
             obj = self.model(**kwargs)
             obj.save()
-            self.log('Created object -> {0}'.format(repr(obj)), level='debug', method='create')
+            self._invalidate()
+            self.log(lambda: 'Created object -> {0}'.format(repr(obj)), level='debug', method='create')
 
             # Create object permissions
             LENSE.OBJECTS.PERMISSIONS.create(obj, permissions)
@@ -207,30 +269,25 @@ class LenseBaseObject(object):
         :type  process: bool
         """
 
-        # Total objects that would be retrieved / objects retrieved
-        count   = self._count(**kwargs)
-        objects = None
-        logobj  = 'process={0}, count={1}, filter={2}'.format(str(process), str(count), str(kwargs))
+        # Retrieve all/filtered objects in a single query
+        ObjectReads.add(self.cls)
+        objects = list(self.model.objects.filter(**kwargs))
+        count   = len(objects)
+        logobj  = lambda: 'process={0}, count={1}, filter={2}'.format(str(process), str(count), str(kwargs))
 
         # No objects found
         if count == 0:
-            self.log('No objects found: filter={0}'.format(str(kwargs)), level='debug', method='_get')
+            self.log(lambda: 'No objects found: filter={0}'.format(str(kwargs)), level='debug', method='_get')
             return None
 
-        # Retrieve all objects
-        if not kwargs:
-            self.log('Retrieving all objects: {0}'.format(logobj), level='debug', method='_get')
-            objects = list(self.model.objects.all())
-
         # Multiple objects found
         if count > 1:
-            self.log('Retrieving multiple objects: {0}'.format(logobj), level='debug', method='_get')
-            objects = list(self.model.objects.filter(**kwargs))
+            self.log(lambda: 'Retrieved multiple objects: {0}'.format(logobj()), level='debug', method='_get')
 
         # Single object
-        if count == 1:
-            self.log('Retrieving single object: {0}'.format(logobj), level='debug', method='_get')
-            objects = self.model.objects.get(**kwargs)
+        else:
+            self.log(lambda: 'Retrieved single object: {0}'.format(logobj()), level='debug', method='_get')
+            objects = objects[0]
 
         # Return and optionally process objects
         return objects if not process else self._process_read(objects)
@@ -248,7 +305,7 @@ class LenseBaseObject(object):
 
         # No objects retrieved
         if not objects:
-            self.log('Cannot delete, no objects found: filter={0}'.format(**kwargs), level='_debug', method='_delete')
+            self.log(lambda: 'Cannot delete, no objects found: filter={0}'.format(str(kwargs)), level='debug', method='_delete')
             return False
 
         # Process delete operation
@@ -267,8 +324,9 @@ class LenseBaseObject(object):
                         LENSE.OBJECTS.PERMISSIONS.flush(obj)
 
                         # Delete the object
-                        self.log('Deleting object -> {0}'.format(repr(obj)), level='debug', method='_delete')
+                        self.log(lambda: 'Deleting object -> {0}'.format(repr(obj)), level='debug', method='_delete')
                         obj.delete()
+                    self._invalidate()
 
                 # Single object
                 else:
@@ -277,8 +335,9 @@ class LenseBaseObject(object):
                     LENSE.OBJECTS.PERMISSIONS.flush(obj)
 
                     # Delete the object
-                    self.log('Deleting object -> {0}'.format(repr(obj)), level='debug', method='_delete')
+                    self.log(lambda: 'Deleting object -> {0}'.format(repr(obj)), level='debug', method='_delete')
                     obj.delete()
+                    self._invalidate()
 
             # Delete operation(s) failed
             except Exception as e:
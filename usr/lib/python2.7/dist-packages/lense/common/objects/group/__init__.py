@@ -21,7 +21,7 @@ class ObjectInterface(LenseBaseObject):
         for k,v in {
             'members': [x.member.uuid for x in LENSE.OBJECTS.as_list(self.MEMBERS.get(group=uuid))]
         }.iteritems():
-            self.log('Extending group {0} attributes -> {1}={2}'.format(uuid,k,v), level='debug', method='extend')
+            self.log(lambda: 'Extending group {0} attributes -> {1}={2}'.format(uuid,k,v), level='debug', method='extend')
             LENSE.OBJECTS.setattr(group, k, v)
         return group
 
@@ -75,6 +75,10 @@ class ObjectInterface(LenseBaseObject):
         # Add the user to the group
         try:
             group.members_set(member)
+
+            # Group and user responses include memberships
+            self._invalidate()
+            LENSE.OBJECTS.USER._invalidate()
             return True
         except Exception as e:
             LENSE.LOG.exception('Failed to add user "{0}" to group "{1}": {2}'.format(member.username, group.name, str(e)))
@@ -107,6 +111,10 @@ class ObjectInterface(LenseBaseObject):
         # Remove the user from the group
         try:
             group.members_unset(user)
+
+            # Group and user responses include memberships
+            self._invalidate()
+            LENSE.OBJECTS.USER._invalidate()
             return True
         except Exception as e:
             LENSE.LOG.exception('Failed to remove user "{0}" from group "{1}": {2}'.format(user.username, group.name))
@@ -209,8 +217,9 @@ class ObjectInterface(LenseBaseObject):
             error = 'Could not find group',
             code  = 404)
 
-        # Update the group
+        # Update the group, request user records store group names
         super(ObjectInterface, self).update(group, **kwargs)
+        LENSE.OBJECTS.USER._invalidate()
 
         # Get and return the updated group
         return self.get(uuid=uuid)
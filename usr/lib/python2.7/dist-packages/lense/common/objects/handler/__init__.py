@@ -4,6 +4,7 @@ from importlib import import_module
 # Lense Libraries
 from lense import import_class
 from lense.common.objects.base import LenseBaseObject
+from lense.common.manifest.cache import ManifestCache
 
 class ObjectInterface(LenseBaseObject):
     def __init__(self):
@@ -47,7 +48,7 @@ class ObjectInterface(LenseBaseObject):
         for k,v in {
             'manifest': self.get_manifest(uuid)
         }.iteritems():
-            self.log('Extending handler {0} attributes -> {1}={2}'.format(uuid,k,v), level='debug', method='extend')
+            self.log(lambda: 'Extending handler {0} attributes -> {1}={2}'.format(uuid,k,v), level='debug', method='extend')
             LENSE.OBJECTS.setattr(handler, k, v)
         return handler
     
@@ -74,6 +75,8 @@ class ObjectInterface(LenseBaseObject):
         
         # Save the manifest
         self.manifest(handler=handler, json=manifest).save()
+        ManifestCache.invalidate(handler.uuid)
+        self._invalidate()
         self.log('Created manifest for handler: {0}'.format(handler.uuid), level='info', method='create_manifest')
     
     def update_manifest(self, handler, manifest):
@@ -89,6 +92,8 @@ class ObjectInterface(LenseBaseObject):
         manifest_object = self.manifest(handler=handler.uuid)
         manifest_object.json = manifest
         manifest_object.save()
+        ManifestCache.invalidate(handler.uuid)
+        self._invalidate()
         self.log('Updated manifest for handler: {0}'.format(handler.uuid), level='info', method='update_manifest')
     
     def open(self, **kwargs):
@@ -248,6 +253,7 @@ class ObjectInterface(LenseBaseObject):
             error = 'Failed to delete the handler: {0}'.format(uuid),
             log   = 'Deleted handler {0}'.format(uuid),
             code  = 500)
+        self._invalidate()
         
     def list(self):
         """
@@ -1,5 +1,7 @@
 from lense.common.vars import USERS, GROUPS
 from lense.common.objects.base import LenseBaseObject
+from lense.common.manifest.cache import ManifestResponseCache
+from lense.common.objects.permissions.cache import PermissionsCache
 
 class ObjectInterface(LenseBaseObject):
     def __init__(self):
@@ -18,7 +20,11 @@ class ObjectInterface(LenseBaseObject):
 
         # Delete permissinos
         self.model.objects.filter(object_uuid=object_uuid).delete()
-        self.log('Flushing permissions for {0}'.format(repr(obj)), level='debug', method='flush')
+        PermissionsCache.invalidate(object_uuid)
+
+        # Permissions filter every cached response
+        ManifestResponseCache.invalidate()
+        self.log(lambda: 'Flushing permissions for {0}'.format(repr(obj)), level='debug', method='flush')
 
     def create(self, obj, permissions={}):
         """
@@ -59,6 +65,10 @@ class ObjectInterface(LenseBaseObject):
             params[k] = v
 
         # Set permissions
-        self.log('Setting permissions on {0}: owner={1}, group={2}'.format(repr(obj), owner, group), level='debug', method='create')
+        self.log(lambda: 'Setting permissions on {0}: owner={1}, group={2}'.format(repr(obj), owner, group), level='debug', method='create')
         permissions = self.model(**params)
         permissions.save()
+        PermissionsCache.invalidate(object_uuid)
+
+        # Permissions filter every cached response
+        ManifestResponseCache.invalidate()
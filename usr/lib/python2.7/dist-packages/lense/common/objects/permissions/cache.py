@@ -0,0 +1,11 @@
+# Lense Libraries
+from lense.common.cache import LenseCache, LenseTTLCache
+
+class PermissionsCache(LenseTTLCache):
+    """
+    Optional, process wide ACL index of permission rows, keyed by object UUID.
+    Each entry is a tuple of (owner, group, mask) rows. Disabled unless
+    engine.acl_cache_ttl is set.
+    """
+    CACHE  = LenseCache('permissions', maxsize=16384)
+    CONFIG = 'acl_cache_ttl'
@@ -10,6 +10,7 @@ from lense import import_class, set_arg
 from lense.common.utils import rstring
 from lense.common.exceptions import AuthError
 from lense.common.objects.base import LenseBaseObject
+from lense.common.objects.user.cache import UserCache
 
 class ObjectInterface(LenseBaseObject):
     def __init__(self):
@@ -26,6 +27,13 @@ class ObjectInterface(LenseBaseObject):
         # Authentication attributes
         self.auth_error = None
 
+    def _invalidate(self):
+        """
+        Invalidate cached responses and request user records.
+        """
+        super(ObjectInterface, self)._invalidate()
+        UserCache.invalidate()
+
     def extend(self, user):
         """
         Construct extended user attributes.
@@ -34,17 +42,36 @@ class ObjectInterface(LenseBaseObject):
         :type  user: APIUser
         :rtype: APIUser
         """
-        uuid = LENSE.OBJECTS.getattr(user, 'uuid')
+        return self.extend_all([user])[0]
 
-        # Extend the user object
-        for k,v in {
-            'api_key': self.get_key(uuid),
-            'api_token': self.get_token(uuid),
-            'groups': self.get_groups(uuid)
-        }.iteritems():
-            self.log('Extending user {0} attributes -> {1}={2}'.format(uuid,k,v), level='debug', method='extend')
-            LENSE.OBJECTS.setattr(user, k, v)
-        return user
+    def extend_all(self, users):
+        """
+        Construct extended user attributes for a list of users. Keys, tokens and
+        group memberships for every user are loaded with a single query each.
+
+        :param users: The user objects to extend
+        :type  users: list
+        :rtype: list
+        """
+        uuids  = [LENSE.OBJECTS.getattr(user, 'uuid') for user in users]
+
+        # API keys / tokens / groups by user
+        keys   = dict([(k.user_id, k.key) for k in self.KEY.select(user__in=uuids)])
+        tokens = dict([(t.user_id, t.token) for t in self.TOKEN.select(user__in=uuids)])
+        groups = dict([(uuid, []) for uuid in uuids])
+        for m in LENSE.OBJECTS.GROUP.MEMBERS.select('group', member__in=uuids):
+            groups[m.member_id].append({'uuid': m.group.uuid, 'name': m.group.name})
+
+        # Extend the user objects
+        for user, uuid in zip(users, uuids):
+            for k,v in {
+                'api_key': keys.get(uuid),
+                'api_token': tokens.get(uuid),
+                'groups': groups[uuid]
+            }.iteritems():
+                self.log(lambda: 'Extending user {0} attributes -> {1}={2}'.format(uuid,k,v), level='debug', method='extend')
+                LENSE.OBJECTS.setattr(user, k, v)
+        return users
 
     def get(self, **kwargs):
         """
@@ -58,9 +85,7 @@ class ObjectInterface(LenseBaseObject):
 
         # Multiple user objects
         if isinstance(user, list):
-            for u in user:
-                self.extend(u)
-            return user
+            return self.extend_all(user)
 
         # Single user object
         return self.extend(user)
@@ -77,9 +102,7 @@ class ObjectInterface(LenseBaseObject):
 
         # Multiple user objects
         if isinstance(user, list):
-            for u in user:
-                self.extend(u)
-            return user
+            return self.extend_all(user)
 
         # Single user object
         return self.extend(user)
@@ -130,18 +153,10 @@ class ObjectInterface(LenseBaseObject):
         :type  user: str
         :rtype: str
         """
-        uuid = self.get_uuid(user)
-
-        # Does the user have a key entry
-        if self.KEY.exists(user=uuid):
-            user = LENSE.ensure(self.KEY.get_internal(user=uuid),
-                error = 'Could not find user {0} API key'.format(uuid),
-                debug = 'Retrieved user {0} API key object'.format(uuid),
-                code  = 404)
-            return user.key
+        key = self.KEY.get_internal(user=self.get_uuid(user))
 
         # User has no key
-        return None
+        return None if not key else key.key
 
     def get_token(self, user):
         """
@@ -151,18 +166,10 @@ class ObjectInterface(LenseBaseObject):
         :type  user: str
         :rtype: str
         """
-        uuid = self.get_uuid(user)
-
-        # Does the user have a token entry
-        if self.TOKEN.exists(user=uuid):
-            user = LENSE.ensure(self.TOKEN.get_internal(user=uuid),
-                error = 'Could not find user {0} API token'.format(uuid),
-                debug = 'Retrieved user {0} API token object'.format(uuid),
-                code  = 404)
-            return user.token
+        token = self.TOKEN.get_internal(user=self.get_uuid(user))
 
         # User has no token
-        return None
+        return None if not token else token.token
 
     def grant_key(self, user, overwrite=False):
         """
@@ -249,10 +256,9 @@ class ObjectInterface(LenseBaseObject):
         uuid   = self.get_uuid(user)
         groups = []
 
-        # Is the user a member of any groups
-        if LENSE.OBJECTS.GROUP.MEMBERS.exists(member=uuid):
-            for user_group in LENSE.OBJECTS.as_list(LENSE.OBJECTS.GROUP.MEMBERS.get_internal(member=uuid)):
-                groups.append({'uuid': user_group.group.uuid, 'name': user_group.group.name})
+        # Any groups the user is a member of
+        for user_group in LENSE.OBJECTS.GROUP.MEMBERS.select('group', member=uuid):
+            groups.append({'uuid': user_group.group.uuid, 'name': user_group.group.name})
         return groups
 
     def member_of(self, user, group):
@@ -510,6 +516,7 @@ class ObjectInterface(LenseBaseObject):
             error = 'Failed to enable user account {0}'.format(uuid),
             log   = 'Enabled user account {0}'.format(uuid),
             code  = 500)
+        self._invalidate()
 
         # OK
         return True
@@ -543,6 +550,7 @@ class ObjectInterface(LenseBaseObject):
             error = 'Failed to disable user account {0}'.format(uuid),
             log   = 'Disabled user account {0}'.format(uuid),
             code  = 500)
+        self._invalidate()
 
         # OK
         return True
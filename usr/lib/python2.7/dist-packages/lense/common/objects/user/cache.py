@@ -0,0 +1,47 @@
+from collections import namedtuple
+
+# Lense Libraries
+from lense.common.cache import LenseCache, LenseTTLCache
+
+# Plain request user record, model instances are not shared between requests
+UserRecord = namedtuple('UserRecord', ['uuid', 'username', 'email', 'is_active', 'from_ldap'])
+
+class UserCache(LenseTTLCache):
+    """
+    Optional, short lived process wide cache of request user records, keyed by
+    username. Disabled unless engine.user_cache_ttl is set.
+    """
+    CACHE  = LenseCache('users', maxsize=1024)
+    CONFIG = 'user_cache_ttl'
+
+    @classmethod
+    def get(cls, username):
+        """
+        Retrieve a cached user record and group memberships.
+
+        :param username: The username
+        :type  username: str
+        :rtype: tuple|None
+        """
+        cached = super(UserCache, cls).get(username)
+        if cached is None:
+            return None
+        return (cached[0], [{'uuid': uuid, 'name': name} for uuid, name in cached[1]])
+
+    @classmethod
+    def store(cls, username, user, groups):
+        """
+        Store a user record. Only plain attribute values are kept, not the
+        user model instance.
+
+        :param username: The username
+        :type  username: str
+        :param     user: The user record or model instance
+        :type      user: UserRecord|APIUser|None
+        :param   groups: The user's group memberships
+        :type    groups: list
+        :rtype: tuple
+        """
+        record = None if not user else UserRecord(user.uuid, user.username, user.email, user.is_active, user.from_ldap)
+        super(UserCache, cls).store(username, (record, tuple([(g['uuid'], g['name']) for g in groups])))
+        return (record, groups)
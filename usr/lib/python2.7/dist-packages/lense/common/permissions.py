@@ -1,117 +1,268 @@
+from collections import namedtuple
+
+# Lense Libraries
 from lense import import_class
 from lense.common.vars import GROUPS
+from lense.common.utils import log_enabled, log_message
+from lense.common.objects.permissions.cache import PermissionsCache
 
 # Access types
 FLAGS = ['read', 'write', 'delete', 'exec']
 
+# Permission levels
+LEVELS = ['user', 'group', 'all']
+
+# Permission flag fields, in mask bit order
+MASK_FIELDS = ['{0}_{1}'.format(l, f) for l in LEVELS for f in FLAGS]
+
+# Access type -> user/group/all mask bits
+ACCESS_BITS = dict([(f, tuple([1 << MASK_FIELDS.index('{0}_{1}'.format(l, f)) for l in LEVELS])) for f in FLAGS])
+
+# Permission row fields
+ROW_FIELDS = ['object_uuid', 'owner', 'group'] + MASK_FIELDS
+
+# Maximum object UUIDs per permissions query
+IN_MAX = 500
+
+def permission_mask(flags):
+    """
+    Encode permission flags as a 12 bit mask.
+
+    :param flags: The flag values in MASK_FIELDS order
+    :type  flags: list
+    :rtype: int
+    """
+    mask = 0
+    for i, flag in enumerate(flags):
+        if flag:
+            mask |= 1 << i
+    return mask
+
+class LensePrincipal(namedtuple('LensePrincipal', ['uuid', 'group', 'groups', 'admin'])):
+    """
+    Requesting user for permission checks, resolved once per request: the user
+    UUID, active group, group membership UUIDs and administrator flag.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def resolve(cls, user):
+        """
+        Resolve the principal from the request user, which already carries its
+        group memberships.
+
+        :param user: The request user
+        :type  user: LenseRequestUser
+        :rtype: LensePrincipal
+        """
+        groups = frozenset([x['uuid'] for x in (user.groups or [])])
+        return cls(user.uuid, user.group, groups, GROUPS.ADMIN.UUID in groups)
+
 class LensePermissions(object):
     """
     Class for handling permission checks.
     """
     @classmethod
     def log(cls, msg, level='info', method=None):
-        logger = getattr(LENSE.LOG, level, 'info')
+        if not log_enabled(level):
+            return
+        logger = getattr(LENSE.LOG, level, LENSE.LOG.info)
         logger('<{0}{1}:{2}@{3}> {4}'.format(
             'PERMISSIONS', 
             '' if not method else '.{0}'.format(method), 
             LENSE.REQUEST.USER.name,
             LENSE.REQUEST.client,
-            msg
+            log_message(msg)
         ))
     
     @classmethod
-    def _check_access(cls, obj, access_type):
+    def _principal(cls):
         """
-        Internal method for checking access to an object by access type.
+        Return the requesting principal for the current request.
+
+        :rtype: LensePrincipal
+        """
+        return LENSE.REQUEST.PRINCIPAL
+
+    @classmethod
+    def _rows(cls, object_uuids):
+        """
+        Retrieve permission rows for a list of objects as (owner, group, mask)
+        tuples, from the ACL index or a single query for any objects not indexed.
+
+        :param object_uuids: The object UUIDs to retrieve permissions for
+        :type  object_uuids: list
+        :rtype: dict
+        """
+        rows    = {}
+        missing = []
+
+        # Indexed objects
+        for object_uuid in object_uuids:
+            indexed = PermissionsCache.get(object_uuid)
+            if indexed is None:
+                missing.append(object_uuid)
+            else:
+                rows[object_uuid] = indexed
+        if not missing:
+            return rows
+
+        # Retrieve permissions for each chunk of objects
+        MODEL   = import_class('Permissions', 'lense.common.objects.permissions.models', init=False)
+        loaded  = dict([(x, []) for x in missing])
+        uuids   = loaded.keys()
+        for i in xrange(0, len(uuids), IN_MAX):
+            for row in MODEL.objects.filter(object_uuid__in=uuids[i:i + IN_MAX]).values_list(*ROW_FIELDS):
+                loaded[row[0]].append((row[1], row[2], permission_mask(row[3:])))
+
+        # Index the loaded rows
+        for object_uuid, object_rows in loaded.iteritems():
+            rows[object_uuid] = PermissionsCache.store(object_uuid, tuple(object_rows))
+        return rows
+
+    @classmethod
+    def _granted(cls, object_uuid, principal, access_type):
+        """
+        Check access granted to the requesting user without permission rows:
+        administrators, users accessing themselves and members reading their
+        own groups.
+
+        :param object_uuid: The object UUID
+        :type  object_uuid: str
+        :param   principal: The requesting principal
+        :type    principal: LensePrincipal
+        :param access_type: The access type to check
+        :type  access_type: str
+        :rtype: bool
         """
         log_method = '_check_access[{0}]'.format(access_type)
-        
-        # Permissions model
-        MODEL = import_class('Permissions', 'lense.common.objects.permissions.models', init=False)
-        
-        # Validate access type
-        if not access_type in FLAGS:
-            cls.log('Invalid access type: {0}'.format(access_type), level='error', method=log_method)
-            return False
-        
-        # Object UUID
-        object_uuid = LENSE.OBJECTS.getattr(obj, 'uuid')
-        
-        # No UUID
-        if not object_uuid:
-            cls.log('Object has no UUID: {0}'.format(repr(obj)), level='debug', method=log_method)
-            return True
-    
-        # Disable permissions on bootstrap
-        if LENSE.bootstrap:
-            cls.log('Project is bootstrapping, permissions disabled', level='debug', method=log_method)
-            return True
-    
-        # Get/set object permissions
-        permissions = [LENSE.OBJECTS.dump(x) for x in list(MODEL.objects.filter(object_uuid=object_uuid))]
-        setattr(obj, '_permissions', permissions)
-        
-        # Log permissions
-        if object_uuid:
-            cls.log('Retrieved permissions: {0}({1}): {2}'.format(
-                MODEL.__name__, 
-                object_uuid, 
-                obj._permissions
-            ), level='debug', method=log_method)
-            
-        # Confirm access
-        api_user   = LENSE.OBJECTS.USER.get_internal(uuid=LENSE.REQUEST.USER.uuid)
-        api_group  = LENSE.REQUEST.USER.group
-        access_str = 'User({0}::{1}):{2}:Object({3})'.format(getattr(api_user, 'uuid', 'anonymous'), api_group, access_type, object_uuid)
-        
+        access_str = lambda: cls._access_str(object_uuid, principal, access_type)
+
         # Administrative access
-        if GROUPS.ADMIN.UUID in [x['uuid'] for x in api_user.groups]:
-            cls.log('Administrative access granted {0}'.format(access_str), level='debug', method=log_method)
+        if principal.admin:
+            cls.log(lambda: 'Administrative access granted {0}'.format(access_str()), level='debug', method=log_method)
             return True
-        
+
         # Read/write access to self (user)
-        if object_uuid == api_user.uuid:
+        if principal.uuid and object_uuid == principal.uuid:
             if access_type in ['read', 'write']:
-                cls.log('User access granted to self {0}'.format(access_str), level='debug', method=log_method)
+                cls.log(lambda: 'User access granted to self {0}'.format(access_str()), level='debug', method=log_method)
                 return True
-        
+
         # Read access to group(s)
-        if object_uuid in [x['uuid'] for x in api_user.groups]:
+        if object_uuid in principal.groups:
             if access_type in ['read']:
-                cls.log('User access granted to own group {0}'.format(access_str), level='debug', method=log_method)
+                cls.log(lambda: 'User access granted to own group {0}'.format(access_str()), level='debug', method=log_method)
                 return True
-        
-        # Access flags
-        access_flag = {
-            'user': 'user_{0}'.format(access_type),
-            'group': 'group_{0}'.format(access_type),
-            'all': 'all_{0}'.format(access_type)
-        }
-        
+        return False
+
+    @classmethod
+    def _evaluate(cls, object_uuid, rows, principal, access_type):
+        """
+        Evaluate permission rows for an object against the requesting user.
+
+        :param object_uuid: The object UUID
+        :type  object_uuid: str
+        :param        rows: The object permission rows
+        :type         rows: list
+        :param   principal: The requesting principal
+        :type    principal: LensePrincipal
+        :param access_type: The access type to check
+        :type  access_type: str
+        :rtype: bool
+        """
+        log_method = '_check_access[{0}]'.format(access_type)
+        access_str = lambda: cls._access_str(object_uuid, principal, access_type)
+        user_bit, group_bit, all_bit = ACCESS_BITS[access_type]
+
+        # Log permissions
+        cls.log(lambda: 'Retrieved permissions: Permissions({0}): {1}'.format(object_uuid, rows), level='debug', method=log_method)
+
         # Check access
-        for pr in obj._permissions:
-            
+        for owner, group, mask in rows:
+
             # User level access
-            if pr['owner'] == api_user.uuid:
-                if pr[access_flag['user']]:
-                    cls.log('User access granted {0}'.format(access_str), level='debug', method=log_method)
-                    return True
-                
+            if owner == principal.uuid and mask & user_bit:
+                cls.log(lambda: 'User access granted {0}'.format(access_str()), level='debug', method=log_method)
+                return True
+
             # Group level access
-            if pr['group'] == api_group:
-                if pr[access_flag['group']]:
-                    cls.log('Group access granted {0}'.format(access_str), level='debug', method=log_method)
-                    return True
-        
+            if group == principal.group and mask & group_bit:
+                cls.log(lambda: 'Group access granted {0}'.format(access_str()), level='debug', method=log_method)
+                return True
+
             # All level access
-            if pr[access_flag['all']]:
-                cls.log('All access granted {0}'.format(access_str), level='debug', method=log_method)
+            if mask & all_bit:
+                cls.log(lambda: 'All access granted {0}'.format(access_str()), level='debug', method=log_method)
                 return True
-        
+
         # Access denied
-        cls.log('Access denied {0}'.format(access_str), level='debug', method=log_method)
+        cls.log(lambda: 'Access denied {0}'.format(access_str()), level='debug', method=log_method)
         return False
-    
+
+    @staticmethod
+    def _access_str(object_uuid, principal, access_type):
+        """
+        Describe an access check for log messages.
+
+        :rtype: str
+        """
+        return 'User({0}::{1}):{2}:Object({3})'.format(principal.uuid or 'anonymous', principal.group, access_type, object_uuid)
+
+    @classmethod
+    def filter(cls, objects, access_type):
+        """
+        Return the objects the current API user/group has access to. Permission
+        rows are only retrieved for objects not granted to the requesting user
+        outright, in a single query.
+
+        :param     objects: The objects to check
+        :type      objects: list
+        :param access_type: The access type to check
+        :type  access_type: str
+        :rtype: list
+        """
+        log_method = '_check_access[{0}]'.format(access_type)
+
+        # Validate access type
+        if not access_type in FLAGS:
+            cls.log('Invalid access type: {0}'.format(access_type), level='error', method=log_method)
+            return []
+
+        # Disable permissions on bootstrap
+        if LENSE.bootstrap:
+            cls.log('Project is bootstrapping, permissions disabled', level='debug', method=log_method)
+            return list(objects)
+
+        # Requesting user / object UUIDs / objects requiring permission rows
+        principal = cls._principal()
+        checks    = []
+        pending   = []
+        for obj in objects:
+            object_uuid = LENSE.OBJECTS.getattr(obj, 'uuid')
+
+            # No UUID
+            if not object_uuid:
+                cls.log(lambda: 'Object has no UUID: {0}'.format(repr(obj)), level='debug', method=log_method)
+                checks.append((obj, object_uuid, True))
+                continue
+
+            granted = cls._granted(object_uuid, principal, access_type)
+            checks.append((obj, object_uuid, granted))
+            if not granted:
+                pending.append(object_uuid)
+
+        # Permission rows for the remaining objects
+        rows = {} if not pending else cls._rows(pending)
+        return [obj for obj, object_uuid, granted in checks if granted or cls._evaluate(object_uuid, rows[object_uuid], principal, access_type)]
+
+    @classmethod
+    def _check_access(cls, obj, access_type):
+        """
+        Internal method for checking access to an object by access type.
+        """
+        return bool(cls.filter([obj], access_type))
+
     @classmethod
     def can_read(cls, obj):
         """
@@ -1,9 +1,6 @@
 import json
 from copy import copy
 from re import compile
-from sys import getsizeof
-from urllib import unquote
-from six import string_types
 from uuid import uuid4
 
 # Django Libraries
@@ -12,12 +9,18 @@ from django.test.client import RequestFactory
 # Lense Libraries
 from lense import import_class
 from lense.common import logger
-from lense.common.utils import truncate
+from lense.common.utils import truncate, cached_attribute, log_enabled, log_message
 from lense.common.collection import Collection, merge_dict
 from lense.common.exceptions import RequestError
-from lense.common.http import HTTP_GET, HTTP_POST, HTTP_PUT, HEADER, PATH, HEADER_FORMAT
+from lense.common.permissions import LensePrincipal
+from lense.common.manifest.resolver import ManifestResolver
+from lense.common.objects.user.cache import UserCache, UserRecord
+from lense.common.http import HTTP_GET, HTTP_POST, HTTP_PUT, HEADER, PATH, HEADER_FORMAT, MIME_TYPE, JSON_START, json_decode
 from django.template.defaultfilters import default
 
+# First non-whitespace character in request data
+FIRST_CHAR = compile(r'\s*(\S)')
+
 class LenseRequestBase(object):
     """
     Base class for request related class objects.
@@ -27,13 +30,16 @@ class LenseRequestBase(object):
 
     def log(self, msg, level='info', method=None):
         """
-        Log wrapper per handler.
+        Log wrapper per handler. The message may be a method returning the message,
+        which is only called if the log level is enabled.
         """
-        logger = getattr(LENSE.LOG, level, 'info')
+        if not log_enabled(level):
+            return
+        logger = getattr(LENSE.LOG, level, LENSE.LOG.info)
         logger('<{0}{1}> {2}'.format(
             self.logpre,
             '' if not method else '.{0}'.format(method),
-            msg
+            log_message(msg)
         ))
 
 class LenseWSGIRequest(object):
@@ -87,6 +93,49 @@ class LenseWSGIRequest(object):
         # Return the request object
         return request
 
+class LenseDirectRequest(object):
+    """
+    Lightweight request object for dispatching requests in-process. Only the
+    attributes read by the request object are set, no WSGI environment is built
+    and request data is passed through without serializing it.
+    """
+    def __init__(self, path, method=HTTP_GET, user=None):
+        """
+        :param   path: The API request path
+        :type    path: str
+        :param method: The API request method
+        :type  method: str
+        :param   user: The API user making the request
+        :type    user: str
+        """
+        self.META    = {
+            'REQUEST_METHOD': method,
+            'PATH_INFO':      '/{0}'.format(path),
+            'REQUEST_URI':    '/api/{0}'.format(path),
+            'SCRIPT_NAME':    '/api',
+            'SERVER_PORT':    '10550',
+            'REMOTE_ADDR':    '127.0.0.1',
+            'HTTP_HOST':      '127.0.0.1:80',
+            'QUERY_STRING':   ''
+        }
+
+        # Request user header
+        if user:
+            self.META[HEADER_FORMAT(HEADER.API_USER)] = user
+
+        # Empty request variables / body, default user / session
+        self.GET     = {}
+        self.POST    = {}
+        self.body    = ''
+        self.user    = import_class('AnonymousUser', 'django.contrib.auth.models')
+        self.session = {}
+
+    def read(self, *args):
+        """
+        Read the request body.
+        """
+        return self.body
+
 class LenseRequestSession(LenseRequestBase):
     """
     Helper class for handling session attributes.
@@ -101,7 +150,7 @@ class LenseRequestSession(LenseRequestBase):
         self.id       = getattr(session, 'session_key', None)
 
         # Log the session attributes
-        self.log('Loading session "{0}" data: {1}'.format(self.id, dict(session)), level='debug', method='__init__')
+        self.log(lambda: 'Loading session "{0}" data: {1}'.format(self.id, dict(session)), level='debug', method='__init__')
 
     def __repr__(self):
         return '<LenseRequestSession({0})>'.format(self.id)
@@ -111,40 +160,49 @@ class LenseRequestSession(LenseRequestBase):
         Set a new session value or update an existing one
         """
         self._session[key] = value
-        self.log('Setting session key: {0}={1}'.format(key, value), level='debug', method='set')
+        self.log(lambda: 'Setting session key: {0}={1}'.format(key, value), level='debug', method='set')
 
     def get(self, key, default=None):
         """
         Retrieve a session value.
         """
         key_value = getattr(self._session, key, default)
-        self.log('Retrieving session key: {0}={1}'.format(key, key_value), level='debug', method='get')
+        self.log(lambda: 'Retrieving session key: {0}={1}'.format(key, key_value), level='debug', method='get')
         return key_value
 
 class LenseRequestUser(LenseRequestBase):
     """
     Helper class for extracting and storing user attributes.
     """
-    def __init__(self, request):
+    def __init__(self, request, headers):
+        """
+        :param request: The Django request object
+        :type  request: HttpRequest
+        :param headers: The parsed Lense request headers
+        :type  headers: RequestHeaders
+        """
         super(LenseRequestUser, self).__init__()
 
-        # Internal Django request / user object / username / user model
+        # Internal Django request / Lense headers / user object / username / user model
         self._request   = request
+        self._headers   = headers
         self.object     = request.user
-        self.name       = self._getattr('username', header=HEADER.API_USER, default='anonymous')
-        self.model      = self._getmodel()
+        self.name       = self._getattr('username', header='API_USER', default='anonymous')
+
+        # User record / group memberships
+        self.model, self.groups = self._getmodel()
 
         # User attributes
-        self.group      = self._getattr('group', header=HEADER.API_GROUP, session='active_group', default='anonymous')
+        self.group      = self._getattr('group', header='API_GROUP', session='active_group', default='anonymous')
         self.authorized = self._getattr('is_authenticated', default=False)
         self.admin      = self._getattr('is_admin', default=False, session='is_admin', model=True)
-        self.active     = self._getattr('is_active', default=False, model=True)
+        self.active     = self._modelattr('is_active', default=False)
         self.passwd     = self._getattr('password', default=None, post=True)
-        self.room       = self._getattr('room', header=HEADER.API_ROOM)
-        self.uuid       = self._getattr('uuid', default=None, model=True)
+        self.room       = self._getattr('room', header='API_ROOM')
+        self.uuid       = self._modelattr('uuid', default=None)
 
         # Log user details
-        self.log('Constructed request user object: name={0}, group={1}, authorized={2}, admin={3}, active={4}'.format(
+        self.log(lambda: 'Constructed request user object: name={0}, group={1}, authorized={2}, admin={3}, active={4}'.format(
             self.name,
             self.group,
             self.authorized,
@@ -157,14 +215,38 @@ class LenseRequestUser(LenseRequestBase):
 
     def _getmodel(self):
         """
-        Retrieve the user model.
+        Retrieve the user record and group memberships in a single query, joining
+        the user's group memberships, if any, onto the user row.
+
+        :rtype: tuple
         """
+        cached = UserCache.get(self.name)
+        if cached:
+            return cached
+
+        # One row per group membership, or a single row without a group
         model = import_class('APIUser', 'lense.common.objects.user.models', init=False)
+        rows  = list(model.objects.filter(username=self.name).values_list(*(list(UserRecord._fields) + [
+            'apigroupmembers__group__uuid',
+            'apigroupmembers__group__name'
+        ])))
 
-        # Return the user model
-        if model.objects.filter(username=self.name).count():
-            return model.objects.get(username=self.name)
-        return None
+        # Unknown user
+        if not rows:
+            return UserCache.store(self.name, None, [])
+
+        # User record / group memberships
+        user   = UserRecord(*rows[0][:len(UserRecord._fields)])
+        groups = [{'uuid': r[-2], 'name': r[-1]} for r in rows if r[-2] is not None]
+        return UserCache.store(self.name, user, groups)
+
+    def _modelattr(self, key, default=None):
+        """
+        Helper method for retrieving a user model attribute.
+        """
+        if self.model:
+            return getattr(self.model, key, default)
+        return self._getattr(key, default=default)
 
     def _getattr(self, key, default=None, header=None, session=None, model=False, post=False):
         """
@@ -176,8 +258,8 @@ class LenseRequestUser(LenseRequestBase):
             return self._request.session.get(session, default)
 
         # Attempt header retrieval
-        if header and HEADER_FORMAT(header) in self._request.META:
-            return self._request.META.get(HEADER_FORMAT(header), default)
+        if header and getattr(self._headers, header) is not None:
+            return getattr(self._headers, header)
 
         # Attempt model retrieval
         if model and self.model:
@@ -201,7 +283,7 @@ class LenseRequestObject(LenseRequestBase):
         """
         Log incoming requests to the request log.
         """
-        self.log('method={0}, path={1}, client={2}, user={3}, group={4}, key={5}, token={6}, data={7}'.format(
+        self.log(lambda: 'method={0}, path={1}, client={2}, user={3}, group={4}, key={5}, token={6}, data={7}'.format(
             self.method,
             self.path,
             self.client,
@@ -212,79 +294,119 @@ class LenseRequestObject(LenseRequestBase):
             truncate(str(self.data))
         ), level='debug', method='_log_request')
 
-    def _parse_data(self, data_str):
+    def _parse_data(self, data_str, content_type=None):
         """
-        Parse a data query string or request body.
+        Parse a data query string or request body in a single pass. Form encoded
+        data is parsed as a query string, anything that looks like JSON is decoded
+        first and falls back to the query string parser.
+
+        :param     data_str: The query string or request body
+        :type      data_str: str
+        :param content_type: The request body media type
+        :type  content_type: str
         """
         if not data_str:
             return {}
 
-        # Try JSON first
-        try:
-            data_obj = json.loads(data_str)
-            self.log('Parsed JSON request data: {0}'.format(data_str), level='debug', method='_parse_data')
-            return data_obj
-
-        # Query string?
-        except Exception as e:
+        # JSON body / value, checking the first character without copying the data
+        start = FIRST_CHAR.match(data_str)
+        if not content_type == MIME_TYPE.APPLICATION.FORM and start and start.group(1) in JSON_START:
             try:
-                data_obj = LENSE.HTTP.parse_query_string(data_str)
-                self.log('Parsed query string request data: {0}'.format(data_str), level='debug', method='_parse_data')
-                return data_obj
+                data_obj, is_json = json_decode(data_str), True
+            except ValueError:
+                data_obj, is_json = None, False
 
-            # Request body not query string or JSON string
-            except Exception as e:
-                self.log('Failed to parse data string ({0}): {1}'.format(data_str, str(e)), level='exception', method='_parse_data')
-                return {}
+            # Decode any HTML entities and bool strings
+            if is_json:
+                self.log(lambda: 'Parsed JSON request data: {0}'.format(data_str), level='debug', method='_parse_data')
+                if not isinstance(data_obj, dict):
+                    raise RequestError('Request data must be an object', code=400)
+                return {k:LENSE.HTTP.decode_value(v) for k,v in data_obj.iteritems()}
+
+        # Query string
+        data_obj = LENSE.HTTP.parse_query_string(data_str, decode=True)
+        self.log(lambda: 'Parsed query string request data: {0}'.format(data_str), level='debug', method='_parse_data')
+        return data_obj
+
+    def _read_body(self):
+        """
+        Read the request body, rejecting bodies larger than the configured maximum.
+        Bodies are read from the WSGI input at most once and no further than one
+        byte past the maximum, so bodies without a Content-Length are limited too.
+        The body is shared with the Django request, so request.body and form
+        parsing still work after the read.
+
+        :rtype: str
+        """
+        conf  = getattr(LENSE.CONF, 'engine', None)
+        limit = getattr(conf, 'request_max_body', 10485760)
+        error = 'Request body of {0} bytes exceeds the maximum of {1} bytes'
+
+        # Reject bodies with an oversized Content-Length before reading
+        if limit and self.size > limit:
+            raise RequestError(error.format(self.size, limit), code=413)
+
+        # Body already read
+        if 'body' in self.__dict__:
+            return self.__dict__['body']
+        if hasattr(self.DJANGO, '_body'):
+            body = self.DJANGO.body
+
+        # Read the body, at most one byte past the maximum
+        else:
+            body = self.DJANGO.read(limit + 1) if limit else self.DJANGO.read()
+
+            # Share the body with Django, the string is not copied
+            self.DJANGO._body = body
+
+        # Reject oversized bodies
+        if limit and len(body) > limit:
+            raise RequestError(error.format('more than {0}'.format(limit), limit), code=413)
+
+        # Raw request body
+        self.__dict__['body'] = body
+        return body
 
     def _load_data(self):
         """
         Load request data depending on the method. For POST requests, load the request
         body, for GET requests, load the query string.
         """
+        content_type  = LENSE.HTTP.content_type(self.DJANGO.META)
 
         # Extract request body / query string
-        request_body  = getattr(self.DJANGO, 'body', '{}')
+        request_body  = self._read_body()
         request_query = self.DJANGO.META.get('QUERY_STRING', '')
 
         # Log incoming data
-        self.log('Processing request data: body=({0}), query_string=({1})'.format(request_body, request_query), level='debug', method='_load_data')
+        self.log(lambda: 'Processing request data: body=({0}), query_string=({1})'.format(request_body, request_query), level='debug', method='_load_data')
 
         # Return an request data
         try:
             merged_data = merge_dict(
-                self._parse_data(request_body),
+                self._parse_data(request_body, content_type),
                 self._parse_data(request_query)
             )
 
-            # Decode any HTML entities and bool strings
-            self.log('Decoding HTML/boolean entities', level='debug', method='_load_data')
-            for k,v in merged_data.iteritems():
-                if isinstance(v, string_types):
-                    merged_data[k] = unquote(v).decode('utf8')
-                if (v in ['True', 'False']):
-                    merged_data[k] = True if (v == 'True') else False
-
-        # Failed to merge data, key conflict
+        # Failed to parse or merge data, key conflict
         except Exception as e:
             raise RequestError('Failed to parse request data: {0}'.format(str(e)), code=400)
-            return {}
 
         # Log the merged data and return
-        self.log('Loaded request data: {0}'.format(json.dumps(merged_data)), level='debug', method='_load_data')
+        self.log(lambda: 'Loaded request data: {0}'.format(json.dumps(merged_data)), level='debug', method='_load_data')
         return merged_data
 
     def _get_key(self):
         """
         Attempt to retrieve an API key from headers.
         """
-        return self.headers.get('HTTP_{0}'.format(HEADER.API_KEY.upper().replace('-', '_')), '')
+        return self.HEADERS.API_KEY or ''
 
     def _get_token(self):
         """
         Attempt to retrieve an API token from headers.
         """
-        return self.headers.get('HTTP_{0}'.format(HEADER.API_TOKEN.upper().replace('-', '_')), '')
+        return self.HEADERS.API_TOKEN or ''
 
     def _get_header_value(self, key, default=None, regex=None):
         """
@@ -333,20 +455,159 @@ class LenseRequestObject(LenseRequestBase):
         kwargs['exc'] = RequestError
         return LENSE.ensure(*args, **kwargs)
 
-    def set(self, request):
+    def usage(self):
         """
+        Return which lazy request attributes were computed for the current request.
+
+        :rtype: dict
+        """
+        names = cached_attribute.names(type(self))
+        used  = list(getattr(self, '_accessed', []))
+        return {
+            'used': used,
+            'unused': [n for n in names if not n in used]
+        }
+
+    @cached_attribute
+    def size(self):
+        """
+        Request body size from the Content-Length header.
+        """
+        try:
+            return int(self.HEADERS.CONTENT_LENGTH or 0)
+        except ValueError:
+            return 0
+
+    @cached_attribute
+    def data(self):
+        """
+        Request payload.
+        """
+        return self._load_data()
+
+    @cached_attribute
+    def body(self):
+        """
+        Raw request body.
+        """
+        return self._read_body()
+
+    @cached_attribute
+    def USER(self):
+        """
+        Request user.
+        """
+        return LenseRequestUser(self.DJANGO, self.HEADERS)
+
+    @cached_attribute
+    def PRINCIPAL(self):
+        """
+        Requesting user for permission checks.
+        """
+        return LensePrincipal.resolve(self.USER)
+
+    @cached_attribute
+    def SESSION(self):
+        """
+        Request session.
+        """
+        return LenseRequestSession(self.DJANGO.session)
+
+    @cached_attribute
+    def is_anonymous(self):
+        """
+        Anonymous request flag.
+        """
+        return True if not self.USER.name else False
+
+    @cached_attribute
+    def key(self):
+        """
+        API key.
+        """
+        return self._get_key()
+
+    @cached_attribute
+    def token(self):
+        """
+        API token.
+        """
+        return self._get_token()
+
+    @cached_attribute
+    def _GET(self):
+        """
+        GET variables.
+        """
+        return Collection(self.DJANGO.GET, cached=True).get()
+
+    @cached_attribute
+    def _POST(self):
+        """
+        POST variables.
+        """
+        return Collection(self.DJANGO.POST, cached=True).get()
+
+    @cached_attribute
+    def view(self):
+        """
+        Portal view.
+        """
+        return self.GET('view', None)
+
+    @cached_attribute
+    def callback(self):
+        """
+        Portal callback.
+        """
+        return self.HEADERS.API_CALLBACK
+
+    @cached_attribute
+    def trace(self):
+        """
+        Manifest execution tracing flag.
+        """
+        return True if self.HEADERS.API_TRACE else False
+
+    @cached_attribute
+    def uuid(self):
+        """
+        Request UUID.
+        """
+        return str(uuid4())
+
+    def set(self, request, data=None):
+        """
+        Set the request attributes from an incoming request. Attributes that require
+        parsing, database queries or additional objects are computed on first access.
+
         @param request: The incoming Django request object
         @type  project: DjangoRequest
+        @param    data: Request data to use instead of parsing the request
+        @type     data: dict
         """
         super(LenseRequestObject, self).__init__()
 
-        # Store the raw request object and headers
+        # Request attributes are replaced, invalidate resolved commons paths
+        ManifestResolver.invalidate()
+
+        # Discard lazy attributes from the previous request
+        cached_attribute.reset(self)
+        self._accessed    = []
+
+        # Request data passed in directly
+        if data is not None:
+            self.data     = data
+
+        # Store the raw request object, headers and Lense headers
         self.DJANGO       = request
         self.headers      = request.META
+        self.HEADERS      = LENSE.HTTP.headers(request.META)
 
         # Request method / path / client / host / agent / query string / script / current URI
         self.method       = self._get_header_value('REQUEST_METHOD')
-        self.path         = self._get_header_value('PATH_INFO', regex=compile(r'^\/?(.*$)'))
+        self.path         = self._get_header_value('PATH_INFO', '')
+        self.path         = self.path[1:] if self.path.startswith('/') else self.path
         self.client       = self._get_header_value('REMOTE_ADDR')
         self.host         = self._get_header_value('HTTP_HOST').split(':')[0]
         self.agent        = self._get_header_value('HTTP_USER_AGENT')
@@ -355,36 +616,30 @@ class LenseRequestObject(LenseRequestBase):
         self.current      = self._get_header_value('REQUEST_URI')
         self.port         = self._get_header_value('SERVER_PORT')
 
-        # Request size / payload
-        self.size         = int(getsizeof(getattr(request, 'body', '')))
-        self.data         = self._load_data()
-
-        # Request user / session
-        self.USER         = LenseRequestUser(request)
-        self.SESSION      = LenseRequestSession(request.session)
-
-        # Anonymous / token request boolean flags
-        self.is_anonymous = True if not self.USER.name else False
+        # Token request boolean flag
         self.is_token     = True if (self.path == PATH.GET_TOKEN) else False
 
-        # API key / token
-        self.key          = self._get_key()
-        self.token        = self._get_token()
-
-        # Method / GET / POST / body data
-        self._GET         = Collection(request.GET).get()
-        self._POST        = Collection(request.POST).get()
-        self.body         = request.body
-
-        # Portal request attributes
-        self.view         = self.GET('view', None)
-        self.callback     = self._get_header_value(HEADER_FORMAT(HEADER.API_CALLBACK))
-
-        # Request UUID
-        self.uuid         = str(uuid4())
+        # Handler UUID, set when the request is mapped
+        self.handler      = None
 
         # Setup authentication
         LENSE.SETUP.auth()
 
         # Debug logging for each request
         self._log_request()
+
+    def set_direct(self, path, method=HTTP_GET, data=None, user=None):
+        """
+        Set the request attributes for an in-process request, without constructing
+        a WSGI request or serializing the request data.
+
+        :param   path: The API request path
+        :type    path: str
+        :param method: The API request method
+        :type  method: str
+        :param   data: The API request data
+        :type    data: dict
+        :param   user: The API user making the request
+        :type    user: str
+        """
+        self.set(LenseDirectRequest(path, method, user), data={} if data is None else data)
@@ -1,4 +1,5 @@
 from lense import set_arg
+from lense.common.utils import log_enabled, log_message
 from socketIO_client import SocketIO
 
 class LenseSocketIO(object):
@@ -27,17 +28,19 @@ class LenseSocketIO(object):
         """
         Wrapper method for logging with a prefix.
         
-        :param    msg: The message to log
-        :type     msg: str
+        :param    msg: The message to log, or a method returning the message
+        :type     msg: str|callable
         :param  level: The desired log level
         :type   level: str
         :param method: Optionally append the method to log prefix
         :type  method: str
         """
-        logger = getattr(LENSE.LOG, level, 'info')
+        if not log_enabled(level):
+            return
+        logger = getattr(LENSE.LOG, level, LENSE.LOG.info)
         logger('<SOCKET{0}> {1}'.format(
             '' if not method else '.{0}'.format(method),
-            msg
+            log_message(msg)
         ))
         
     def set(self, params=None):
@@ -65,7 +68,7 @@ class LenseSocketIO(object):
         """
         if self.io and LENSE.CONF.socket.enable:
             self.io.emit('update', {'type': t, 'content': d})
-            self.log('Broadcasting message: type={0}, content={1}'.format(t, d), level='debug', method='broadcast')
+            self.log(lambda: 'Broadcasting message: type={0}, content={1}'.format(t, d), level='debug', method='broadcast')
         
     def loading(self, m=None):
         """
@@ -73,4 +76,4 @@ class LenseSocketIO(object):
         """
         if self.params and self.io and LENSE.CONF.socket.enable:
             self.io.emit('update', { 'room': self.params['room'], 'type': 'loading', 'content': m})
-            self.log('Sending loading message: room={0}, type=loading, content={1}'.format(self.params['room'], m), level='debug', method='loading')
\ No newline at end of file
+            self.log(lambda: 'Sending loading message: room={0}, type=loading, content={1}'.format(self.params['room'], m), level='debug', method='loading')
\ No newline at end of file
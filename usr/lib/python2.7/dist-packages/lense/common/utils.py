@@ -2,8 +2,39 @@ from __future__ import print_function
 import sys
 import string
 import random
+import logging
 from os import geteuid
 
+# Log method names mapped to logging levels
+LOG_LEVELS = {
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+    'exception': logging.ERROR,
+    'critical': logging.CRITICAL
+}
+
+def log_enabled(level):
+    """
+    Check if a log method name, i.e. 'debug', is enabled for the Lense logger.
+
+    :param level: The log method name
+    :type  level: str
+    :rtype: bool
+    """
+    return LENSE.LOG.isEnabledFor(LOG_LEVELS.get(level, logging.INFO))
+
+def log_message(msg):
+    """
+    Resolve a lazy log message.
+
+    :param msg: The log message, or a method returning the message
+    :type  msg: str|callable
+    :rtype: str
+    """
+    return msg() if callable(msg) else msg
+
 def ensure_root():
     """
     Make sure the current process is being run as root or with sudo privileges.
@@ -75,3 +106,64 @@ def mod_has_class(mod, cls, no_launch=False):
         return False
     except Exception as e:
         return False
+
+class cached_attribute(object):
+    """
+    Non-data descriptor that computes an attribute on first access and caches
+    the value on the instance. If the instance has an '_accessed' list, the
+    attribute name is recorded there when it is computed.
+    """
+
+    # Cached attribute names by class
+    NAMES = {}
+
+    def __init__(self, method):
+        """
+        :param method: The method used to compute the attribute value
+        :type  method: function
+        """
+        self.method  = method
+        self.name    = method.__name__
+        self.__doc__ = method.__doc__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        # Compute and cache the value
+        value = instance.__dict__[self.name] = self.method(instance)
+
+        # Record the computed attribute
+        accessed = instance.__dict__.get('_accessed')
+        if accessed is not None:
+            accessed.append(self.name)
+        return value
+
+    @classmethod
+    def names(cls, owner):
+        """
+        Return the names of all cached attributes defined on a class.
+
+        :param owner: The class to inspect
+        :type  owner: type
+        :rtype: list
+        """
+        if not owner in cls.NAMES:
+            names = []
+            for base in reversed(owner.__mro__):
+                for name, attr in sorted(vars(base).iteritems()):
+                    if isinstance(attr, cls) and not name in names:
+                        names.append(name)
+            cls.NAMES[owner] = names
+        return cls.NAMES[owner]
+
+    @classmethod
+    def reset(cls, instance):
+        """
+        Discard any cached attribute values stored on an instance.
+
+        :param instance: The instance to reset
+        :type  instance: object
+        """
+        for name in cls.names(type(instance)):
+            instance.__dict__.pop(name, None)